@@ -0,0 +1,20 @@
+# Модули URL, которые выбирают представления по BLOG_ASYNC_VIEWS.
+URL_MODULES = ('blog.urls', 'users.urls')
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+BATCH_SIZE = 5000
+TEXT_POOL_SIZE = 1000
+USERNAME_PREFIX = 'bench_'
+PASSWORD = 'benchmark'
+CLIENT_ADDR = '192.0.2.1'
+# Значения SQLite по умолчанию; busy_timeout — как у sqlite3.connect.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'cache_size': -2000,
+    'mmap_size': 0,
+    'busy_timeout': 5000,
+}
@@ -0,0 +1,132 @@
+"""
+Сравнение WSGI с синхронными представлениями и ASGI с асинхронными.
+
+compare_handlers отправляет одновременные запросы к ленте, постам
+и профилям через тестовые клиенты обоих обработчиков.
+"""
+import asyncio
+import importlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import clear_url_caches, reverse
+
+from metrics.stats import percentile
+from .constants import URL_MODULES
+from .seed import sample_targets
+
+
+def _reload_urls():
+    for name in (*URL_MODULES, settings.ROOT_URLCONF):
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+@contextmanager
+def async_views(enabled):
+    """Временно подключает асинхронные или синхронные представления."""
+    try:
+        with override_settings(BLOG_ASYNC_VIEWS=enabled):
+            _reload_urls()
+            yield
+    finally:
+        _reload_urls()
+
+
+def _handler_stats(latencies, statuses, seconds):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'throughput': len(latencies) / seconds,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'errors': sum(status != 200 for status in statuses),
+    }
+
+
+def _run_wsgi(paths, threads):
+    local = threading.local()
+
+    def fetch(path):
+        if not hasattr(local, 'client'):
+            local.client = Client()
+        response = local.client.get(path)
+        return time.perf_counter(), response.status_code
+
+    warmup = Client()
+    for path in set(paths):
+        warmup.get(path)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(fetch, paths))
+    seconds = time.perf_counter() - start
+    return _handler_stats(
+        [(done - start) * 1000 for done, _ in results],
+        [status for _, status in results],
+        seconds,
+    )
+
+
+async def _run_asgi(paths):
+    client = AsyncClient()
+
+    async def fetch(path):
+        response = await client.get(path)
+        return time.perf_counter(), response.status_code
+
+    for path in set(paths):
+        await client.get(path)
+    start = time.perf_counter()
+    results = await asyncio.gather(*map(fetch, paths))
+    seconds = time.perf_counter() - start
+    return _handler_stats(
+        [(done - start) * 1000 for done, _ in results],
+        [status for _, status in results],
+        seconds,
+    )
+
+
+def compare_handlers(concurrency=1000, threads=8, random_seed=0):
+    """
+    Сравнивает WSGI с синхронными представлениями и ASGI с асинхронными.
+
+    Одновременно отправляет concurrency анонимных запросов к ленте,
+    постам и профилям. WSGI обслуживает их threads потоками, как
+    сервер с фиксированным числом потоков; задержка считается от общего
+    старта, то есть включает ожидание в очереди. Перед замером каждый
+    адрес запрашивается один раз, чтобы сравнивать прогретый кеш.
+    debug_toolbar отключается: её middleware только синхронный.
+    """
+    rng = random.Random(random_seed)
+    posts, _, _ = sample_targets()
+    paths = []
+    for _ in range(concurrency):
+        pk, username, _ = rng.choice(posts)
+        paths.append(rng.choice((
+            reverse('blog:index'),
+            reverse('blog:post_detail', args=(pk,)),
+            reverse('users:profile', args=(username,)),
+        )))
+    middleware = [
+        name for name in settings.MIDDLEWARE if 'debug_toolbar' not in name
+    ]
+    results = {}
+    with override_settings(
+        DEBUG=False,
+        MIDDLEWARE=middleware,
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+    ):
+        with async_views(False):
+            cache.clear()
+            results['wsgi'] = _run_wsgi(paths, threads)
+        with async_views(True):
+            cache.clear()
+            results['asgi'] = asyncio.run(_run_asgi(paths))
+    return results
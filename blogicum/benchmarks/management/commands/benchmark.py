@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.replay import replay
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет маршруты блога и профилей через тестовый клиент '
+        'и выводит пропускную способность, p50/p99 и число запросов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=20,
+            help='Сколько раз запросить каждый маршрут.',
+        )
+        parser.add_argument(
+            '--clear-cache',
+            action='store_true',
+            help='Очищать кеш перед каждым запросом.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора случайных чисел.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            results = replay(
+                options['rounds'], options['clear_cache'], options['seed']
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(
+            f'{"URL":<22}{"запросов":>9}{"в сек":>9}{"p50, мс":>9}'
+            f'{"p99, мс":>9}{"SQL p50":>9}{"SQL max":>9}  коды'
+        )
+        for url_name, stats in sorted(results.items()):
+            self.stdout.write(
+                f'{url_name:<22}{stats["requests"]:>9}'
+                f'{stats["throughput"]:>9.1f}{stats["p50"]:>9.1f}'
+                f'{stats["p99"]:>9.1f}{stats["queries_p50"]:>9}'
+                f'{stats["queries_max"]:>9}  '
+                f'{",".join(map(str, stats["statuses"]))}'
+            )
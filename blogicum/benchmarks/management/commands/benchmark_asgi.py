@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.handlers import compare_handlers
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность WSGI с синхронными '
+        'представлениями и ASGI с асинхронными при одновременных '
+        'запросах к ленте, постам и профилям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1000,
+            help='Сколько запросов отправить одновременно.',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Число потоков WSGI-сервера.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора случайных чисел.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            results = compare_handlers(
+                options['concurrency'], options['threads'], options['seed']
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(
+            f'{"":<6}{"запросов":>9}{"в сек":>9}{"p50, мс":>10}'
+            f'{"p99, мс":>10}{"ошибок":>8}'
+        )
+        for handler, stats in results.items():
+            self.stdout.write(
+                f'{handler:<6}{stats["requests"]:>9}'
+                f'{stats["throughput"]:>9.1f}{stats["p50"]:>10.1f}'
+                f'{stats["p99"]:>10.1f}{stats["errors"]:>8}'
+            )
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.sqlite import contention
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает SQLite одновременными комментаторами и читателями '
+        'ленты с прагмами по умолчанию и с SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=4,
+            help='Число потоков, добавляющих комментарии.',
+        )
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=8,
+            help='Число потоков, читающих ленту.',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=10,
+            help='Длительность каждого прогона.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора случайных чисел.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            results = contention(
+                options['writers'], options['readers'],
+                options['seconds'], options['seed'],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(
+            f'{"":<17}{"операций":>9}{"в сек":>9}{"p50, мс":>10}'
+            f'{"p99, мс":>10}{"ошибок":>8}'
+        )
+        for pragmas, roles in results.items():
+            for role, stats in roles.items():
+                self.stdout.write(
+                    f'{pragmas + " " + role:<17}{stats["operations"]:>9}'
+                    f'{stats["throughput"]:>9.1f}'
+                    f'{stats["p50"] or 0:>10.1f}{stats["p99"] or 0:>10.1f}'
+                    f'{stats["errors"]:>8}'
+                )
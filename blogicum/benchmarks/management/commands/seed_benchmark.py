@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.constants import SCALES
+from benchmarks.seed import seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт синтетические данные для нагрузочного стенда. '
+        'Запускайте на отдельной базе: данные не удаляются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scale',
+            help=f'Число постов: {", ".join(SCALES)} или целое число.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора случайных чисел.',
+        )
+
+    def handle(self, *args, **options):
+        scale = options['scale'].lower()
+        try:
+            posts = SCALES.get(scale) or int(scale)
+        except ValueError:
+            raise CommandError(f'Неизвестный масштаб: {scale}')
+        counts = seed(posts, options['seed'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f'Создано: {counts}'))
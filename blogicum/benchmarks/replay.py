@@ -0,0 +1,115 @@
+"""
+Прогон маршрутов blog.urls и users.urls через тестовый клиент.
+
+replay собирает время ответа и число запросов к базе по каждому
+имени URL.
+"""
+import random
+import time
+from contextlib import ExitStack
+
+from django.core.cache import cache
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from blog.constants import SEARCH_QUERY_PARAM
+from blog.models import User
+from metrics.middleware import QueryCounter
+from metrics.stats import percentile
+from .constants import CLIENT_ADDR
+from .seed import sample_targets
+
+
+def _round(rng, posts, comments, categories):
+    """
+    Адреса одного круга: [(имя URL, адрес, пользователь или None)].
+
+    Страницы, доступные только автору, запрашиваются от его имени.
+    """
+    pk, username, title = rng.choice(posts)
+    index = reverse('blog:index')
+    targets = [
+        ('blog:index', index, None),
+        ('blog:index', f'{index}?page={rng.randint(2, 50)}', None),
+        ('blog:category_posts', reverse(
+            'blog:category_posts', args=(rng.choice(categories),)
+        ), None),
+        ('blog:post_detail', reverse('blog:post_detail', args=(pk,)), None),
+        ('blog:search', '{}?{}'.format(
+            reverse('blog:search'),
+            urlencode({SEARCH_QUERY_PARAM: title.split()[0]}),
+        ), None),
+        ('users:profile', reverse('users:profile', args=(username,)), None),
+        ('blog:create_post', reverse('blog:create_post'), username),
+        ('blog:edit_post', reverse('blog:edit_post', args=(pk,)), username),
+        ('blog:delete_post', reverse(
+            'blog:delete_post', args=(pk,)
+        ), username),
+        ('users:edit_profile', reverse(
+            'users:edit_profile', args=(username,)
+        ), username),
+    ]
+    if comments:
+        post_id, comment_id, commenter = rng.choice(comments)
+        targets.append((
+            'blog:edit_comment',
+            reverse('blog:edit_comment', args=(post_id, comment_id)),
+            commenter,
+        ))
+    return targets
+
+
+def _client():
+    # Адрес не из INTERNAL_IPS, чтобы не отрисовывалась debug_toolbar.
+    return Client(HTTP_HOST='localhost', REMOTE_ADDR=CLIENT_ADDR)
+
+
+def replay(rounds, clear_cache=False, random_seed=0):
+    """
+    Прогоняет маршруты blog.urls и users.urls rounds раз.
+
+    Отправляются только GET-запросы, чтобы прогоны не меняли данные
+    и были сравнимы между собой. Возвращает {имя URL: статистика}.
+    """
+    rng = random.Random(random_seed)
+    data = sample_targets()
+    clients = {None: _client()}
+    samples = {}
+    for _ in range(rounds):
+        for url_name, url, username in _round(rng, *data):
+            if username not in clients:
+                clients[username] = _client()
+                clients[username].force_login(
+                    User.objects.get(username=username)
+                )
+            if clear_cache:
+                cache.clear()
+            counter = QueryCounter()
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(counter))
+                start = time.perf_counter()
+                response = clients[username].get(url)
+                elapsed = time.perf_counter() - start
+            samples.setdefault(url_name, []).append(
+                (elapsed * 1000, counter.count, response.status_code)
+            )
+    return {
+        url_name: _stats(rows) for url_name, rows in samples.items()
+    }
+
+
+def _stats(rows):
+    latencies = sorted(row[0] for row in rows)
+    queries = sorted(row[1] for row in rows)
+    return {
+        'requests': len(rows),
+        'throughput': len(rows) / (sum(latencies) / 1000),
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'queries_p50': percentile(queries, 50),
+        'queries_max': queries[-1],
+        'statuses': sorted({row[2] for row in rows}),
+    }
@@ -0,0 +1,163 @@
+"""
+Синтетические данные для нагрузочного стенда.
+
+seed создаёт пользователей, категории, локации, посты и комментарии
+через bulk_create, минуя сигналы, а затем пересчитывает производные
+данные: видимость, счётчики, ленту и поисковый индекс.
+"""
+import random
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from blog import feed, search
+from blog.models import Category, Comment, Location, Post, User
+from .constants import BATCH_SIZE, PASSWORD, TEXT_POOL_SIZE, USERNAME_PREFIX
+
+
+def _next_pk(model):
+    return (model.objects.aggregate(pk=Max('pk'))['pk'] or 0) + 1
+
+
+def _bulk_create(model, objects):
+    total = 0
+    objects = iter(objects)
+    while batch := list(islice(objects, BATCH_SIZE)):
+        model.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+def seed(posts, random_seed=0, log=None):
+    """
+    Создаёт данные на posts постов. Возвращает {модель: число строк}.
+
+    На сто постов приходится один автор, на тысячу — категория и локация,
+    на пост — в среднем два комментария. Десятая часть категорий, каждый
+    двадцатый пост и каждая пятая локация сняты с публикации, каждый
+    двадцатый пост отложен.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(random_seed)
+    fake = Faker('ru_RU')
+    fake.seed_instance(random_seed)
+    sentences = [fake.sentence() for _ in range(TEXT_POOL_SIZE)]
+    texts = [fake.text() for _ in range(TEXT_POOL_SIZE)]
+    now = timezone.now()
+    counts = {}
+
+    first_user = _next_pk(User)
+    user_ids = range(first_user, first_user + max(posts // 100, 10))
+    password = make_password(PASSWORD)
+    counts['users'] = _bulk_create(User, (
+        User(
+            pk=pk,
+            username=f'{USERNAME_PREFIX}{pk}',
+            first_name=fake.first_name(),
+            last_name=fake.last_name(),
+            email=f'{USERNAME_PREFIX}{pk}@example.com',
+            password=password,
+        )
+        for pk in user_ids
+    ))
+    log(f'Пользователей: {counts["users"]}')
+
+    first_category = _next_pk(Category)
+    categories = {
+        pk: rng.random() >= 0.1
+        for pk in range(first_category,
+                        first_category + max(posts // 1000, 5))
+    }
+    counts['categories'] = _bulk_create(Category, (
+        Category(
+            pk=pk,
+            title=rng.choice(sentences),
+            description=rng.choice(texts),
+            slug=f'bench-{pk}',
+            is_published=is_published,
+        )
+        for pk, is_published in categories.items()
+    ))
+    first_location = _next_pk(Location)
+    location_ids = range(first_location,
+                         first_location + max(posts // 1000, 5))
+    counts['locations'] = _bulk_create(Location, (
+        Location(
+            pk=pk, name=fake.city(), is_published=rng.random() >= 0.2
+        )
+        for pk in location_ids
+    ))
+    log(f'Категорий: {counts["categories"]}, '
+        f'локаций: {counts["locations"]}')
+
+    first_post = _next_pk(Post)
+    comment_counts = [rng.randint(0, 4) for _ in range(posts)]
+
+    def make_posts():
+        category_ids = list(categories)
+        for index, comment_count in enumerate(comment_counts):
+            category_id = rng.choice(category_ids)
+            is_published = rng.random() >= 0.05
+            if rng.random() < 0.05:
+                pub_date = now + timedelta(days=rng.randint(1, 30))
+            else:
+                pub_date = now - timedelta(minutes=rng.randint(1, 10 ** 6))
+            yield Post(
+                pk=first_post + index,
+                title=rng.choice(sentences),
+                text=rng.choice(texts),
+                pub_date=pub_date,
+                author_id=rng.choice(user_ids),
+                category_id=category_id,
+                location_id=(
+                    rng.choice(location_ids) if rng.random() >= 0.3 else None
+                ),
+                is_published=is_published,
+                is_visible=(
+                    is_published and pub_date <= now
+                    and categories[category_id]
+                ),
+                comment_count=comment_count,
+            )
+
+    def make_comments():
+        for index, comment_count in enumerate(comment_counts):
+            for _ in range(comment_count):
+                yield Comment(
+                    text=rng.choice(sentences),
+                    post_id=first_post + index,
+                    author_id=rng.choice(user_ids),
+                )
+
+    with transaction.atomic():
+        counts['posts'] = _bulk_create(Post, make_posts())
+        log(f'Постов: {counts["posts"]}')
+        counts['comments'] = _bulk_create(Comment, make_comments())
+        log(f'Комментариев: {counts["comments"]}')
+    log(f'Строк ленты: {feed.rebuild()}')
+    log(f'Проиндексировано постов: {search.rebuild_index()}')
+    return counts
+
+
+def sample_targets():
+    """Посты, категории и комментарии, по которым строятся адреса."""
+    posts = list(
+        Post.published.order_by('-pub_date')
+        .values_list('pk', 'author__username', 'title')[:1000]
+    )
+    if not posts:
+        raise ValueError('Нет опубликованных постов: запустите seed.')
+    comments = list(
+        Comment.objects.filter(post_id__in=[pk for pk, _, _ in posts[:100]])
+        .values_list('post_id', 'pk', 'author__username')[:1000]
+    )
+    categories = list(
+        Category.objects.filter(is_published=True)
+        .values_list('slug', flat=True)[:100]
+    )
+    return posts, comments, categories
@@ -0,0 +1,113 @@
+"""
+Нагрузка SQLite одновременными комментаторами и читателями ленты.
+
+contention сравнивает прагмы SQLite по умолчанию с настроенными.
+"""
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+from django.test.utils import override_settings
+
+from blog.constants import POSTS_PER_PAGE
+from blog.models import Comment, Post
+from core.db import SQLITE_PRAGMAS
+from metrics.stats import percentile
+from .constants import DEFAULT_PRAGMAS
+
+
+def _worker(operation, deadline, latencies, errors):
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                operation()
+            except OperationalError:
+                errors.append(1)
+            else:
+                latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        connections.close_all()
+
+
+def _run_contention(targets, writers, readers, seconds, rng):
+    pages = max(Post.published.count() // POSTS_PER_PAGE, 1)
+    lock = threading.Lock()
+
+    def comment():
+        with lock:
+            post_id, author_id = rng.choice(targets)
+        # Комментарий и пересчёт счётчиков фиксируются вместе.
+        with transaction.atomic():
+            Comment.objects.create(
+                post_id=post_id, author_id=author_id, text='Нагрузка'
+            )
+
+    def read_page():
+        with lock:
+            offset = rng.randrange(pages) * POSTS_PER_PAGE
+        list(Post.published.order_by('-pub_date')[
+            offset:offset + POSTS_PER_PAGE
+        ])
+
+    roles = {'writers': (comment, writers), 'readers': (read_page, readers)}
+    samples = {role: ([], []) for role in roles}
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(
+            target=_worker, args=(operation, deadline, *samples[role])
+        )
+        for role, (operation, count) in roles.items()
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results = {}
+    for role, (latencies, errors) in samples.items():
+        latencies.sort()
+        results[role] = {
+            'operations': len(latencies),
+            'throughput': len(latencies) / seconds,
+            'p50': percentile(latencies, 50),
+            'p99': percentile(latencies, 99),
+            'errors': len(errors),
+        }
+    return results
+
+
+def contention(writers=4, readers=8, seconds=10, random_seed=0):
+    """
+    Нагружает базу одновременными комментаторами и читателями ленты.
+
+    Каждый поток работает seconds секунд со своим соединением:
+    комментаторы добавляют комментарии, читатели запрашивают случайные
+    страницы ленты. Прогон повторяется с прагмами SQLite по умолчанию
+    и с SQLITE_PRAGMAS. Возвращает {прагмы: {роль: статистика}};
+    ошибки — это операции, упавшие с «database is locked».
+    """
+    rng = random.Random(random_seed)
+    targets = list(
+        Post.published.order_by('-pub_date')
+        .values_list('pk', 'author_id')[:1000]
+    )
+    if not targets:
+        raise ValueError('Нет опубликованных постов: запустите seed.')
+    profiles = {
+        'default': DEFAULT_PRAGMAS,
+        'tuned': getattr(settings, 'SQLITE_PRAGMAS', SQLITE_PRAGMAS),
+    }
+    results = {}
+    for name, pragmas in profiles.items():
+        # Прагмы применяются к новым соединениям, а journal_mode
+        # меняется, только когда других соединений с файлом нет.
+        connections.close_all()
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            results[name] = _run_contention(
+                targets, writers, readers, seconds, rng
+            )
+    connections.close_all()
+    return results
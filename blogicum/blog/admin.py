@@ -1,51 +1,161 @@
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.core.paginator import Paginator
+from django.forms.models import BaseInlineFormSet
+from django.http import QueryDict
+from django.template.response import TemplateResponse
 
+from . import moderation
+from .constants import ADMIN_INLINE_PER_PAGE
+from .invalidation import set_published
 from .models import Post, Category, Location, Comment
+from .paginators import EstimatedCountPaginator
 
 admin.site.empty_value_display = 'Не задано'
 
 
-class CommentsInline(admin.TabularInline):
-    """Отображение списка комментариев."""
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    """Формы только для одной страницы связанных объектов."""
 
-    fields = ('text', 'created_at', 'author')
-    readonly_fields = ('created_at',)
+    per_page = ADMIN_INLINE_PER_PAGE
+    page_param = 'page'
+    query = QueryDict()
+
+    def get_queryset(self):
+        if not hasattr(self, 'page'):
+            paginator = Paginator(super().get_queryset(), self.per_page)
+            self.page = paginator.get_page(self.query.get(self.page_param))
+            self._queryset = list(self.page)
+        return self._queryset
+
+    def _page_url(self, number):
+        query = self.query.copy()
+        query[self.page_param] = number
+        return f'?{query.urlencode()}'
+
+    def previous_page_url(self):
+        return self._page_url(self.page.previous_page_number())
+
+    def next_page_url(self):
+        return self._page_url(self.page.next_page_number())
+
+
+class PaginatedInlineMixin:
+    """Постраничный inline: номер страницы — в параметре page_param."""
+
+    formset = PaginatedInlineFormSet
+    template = 'admin/paginated_tabular.html'
+    page_param = 'page'
+    extra = 0
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.page_param = self.page_param
+        formset.query = request.GET
+        return formset
+
+
+class CommentsInline(PaginatedInlineMixin, admin.TabularInline):
+    """
+    Отображение списка комментариев постранично.
+
+    Комментарии добавляются на сайте, поэтому новых строк в inline нет.
+    """
+
+    fields = ('text', 'created_at', 'author', 'is_published')
+    readonly_fields = ('created_at', 'author')
     model = Comment
+    page_param = 'comments_page'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
 
-class PostInline(admin.TabularInline):
-    """Отображение списка постов."""
+    def has_add_permission(self, request, obj=None):
+        return False
 
-    fields = (
-        'author',
-        'pub_date',
-        'title',
-        'text',
-        'location',
-        'category',
-        'is_published',
-    )
+
+class PostInline(PaginatedInlineMixin, admin.TabularInline):
+    """
+    Посты категории или локации постранично и только для чтения.
+
+    Править посты удобнее в списке постов: ссылка на него с фильтром
+    выводится под таблицей.
+    """
 
     model = Post
-    extra = 0
+    fields = ('title', 'author', 'pub_date', 'is_published')
+    readonly_fields = fields
+    template = 'admin/post_summary_inline.html'
+    page_param = 'posts_page'
+    show_change_link = True
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class PublicationActionsMixin:
+    """
+    Массовая публикация и снятие с публикации.
+
+    Видимость постов, лента и кеш обновляются одним проходом
+    для всех выбранных объектов.
+    """
+
+    actions = ('publish', 'unpublish')
+
+    @admin.action(
+        description='Опубликовать выбранные', permissions=('change',)
+    )
+    def publish(self, request, queryset):
+        updated = set_published(queryset, True)
+        self.message_user(request, f'Опубликовано: {updated}')
+
+    @admin.action(
+        description='Снять с публикации выбранные', permissions=('change',)
+    )
+    def unpublish(self, request, queryset):
+        updated = set_published(queryset, False)
+        self.message_user(request, f'Снято с публикации: {updated}')
 
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    """Отображение категорий в админке."""
+    """
+    Отображение постов в админке.
+
+    Связанные объекты выбираются поиском, а не списком всех строк,
+    комментарии выводятся постранично, а число постов без фильтров
+    оценивается без COUNT(*).
+    """
 
     list_select_related = ('author', 'location', 'category')
     inlines = (CommentsInline,)
+    autocomplete_fields = ('category', 'location')
+    raw_id_fields = ('author',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def get_queryset(self, request):
         qs = super(PostAdmin, self).get_queryset(request)
         qs = qs.only(
+            'author__id',
             'author__first_name',
             'author__last_name',
             'pub_date',
             'created_at',
             'title',
             'text',
+            'image',
             'location__name',
             'category__title',
             'is_published',
@@ -67,13 +177,13 @@ class PostAdmin(admin.ModelAdmin):
         'category',
         'is_published',
     )
-    search_fields = ('title',)
-    list_filter = ('category', 'author', 'pub_date')
+    search_fields = ('title', 'author__username')
+    list_filter = ('is_published', 'category', 'pub_date')
     list_display_links = ('title',)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(PublicationActionsMixin, admin.ModelAdmin):
     """Отображение категорий в админке"""
 
     inlines = (PostInline,)
@@ -83,13 +193,14 @@ class CategoryAdmin(admin.ModelAdmin):
         'is_published',
         'created_at',
     )
+    search_fields = ('title',)
     list_editable = (
         'is_published',
     )
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(PublicationActionsMixin, admin.ModelAdmin):
     """Отображение локаций в админке"""
 
     inlines = (
@@ -100,6 +211,7 @@ class LocationAdmin(admin.ModelAdmin):
         'is_published',
         'created_at',
     )
+    search_fields = ('name',)
     list_editable = (
         'is_published',
     )
@@ -107,7 +219,72 @@ class LocationAdmin(admin.ModelAdmin):
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
-    """Отображение комментариев в админке"""
+    """
+    Отображение комментариев в админке.
+
+    Действия модерации выполняются одним запросом на всю выборку,
+    счётчики комментариев постов пересчитываются после них.
+    """
 
-    list_display = ('text', 'created_at', 'post')
+    list_display = ('text', 'author', 'post', 'created_at', 'is_published')
+    list_select_related = ('author', 'post')
+    list_filter = ('is_published', 'created_at')
+    search_fields = ('text', 'author__username')
+    date_hierarchy = 'created_at'
     readonly_fields = ('created_at', 'author', 'post')
+    actions = ('hide', 'publish', 'purge_authors', 'purge_posts')
+
+    @admin.action(description='Скрыть выбранные', permissions=('change',))
+    def hide(self, request, queryset):
+        updated = moderation.set_published(queryset, False)
+        self.message_user(request, f'Скрыто: {updated}')
+
+    @admin.action(
+        description='Опубликовать выбранные', permissions=('change',)
+    )
+    def publish(self, request, queryset):
+        updated = moderation.set_published(queryset, True)
+        self.message_user(request, f'Опубликовано: {updated}')
+
+    @admin.action(
+        description='Удалить все комментарии их авторов',
+        permissions=('delete',),
+    )
+    def purge_authors(self, request, queryset):
+        return self._purge(
+            request, queryset, 'purge_authors',
+            authors=queryset.values('author_id'),
+        )
+
+    @admin.action(
+        description='Удалить все комментарии их постов',
+        permissions=('delete',),
+    )
+    def purge_posts(self, request, queryset):
+        return self._purge(
+            request, queryset, 'purge_posts',
+            posts=queryset.values('post_id'),
+        )
+
+    def _purge(self, request, queryset, action, **conditions):
+        """Удаляет комментарии после страницы подтверждения."""
+        comments = moderation.comments_to_purge(**conditions)
+        if request.POST.get('post') != 'yes':
+            return TemplateResponse(
+                request, 'admin/blog/comment/purge_confirmation.html', {
+                    **self.admin_site.each_context(request),
+                    'title': 'Вы уверены?',
+                    'opts': self.model._meta,
+                    'action': action,
+                    'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+                    'queryset': queryset,
+                    'purge_count': comments.count(),
+                },
+            )
+        deleted = moderation.delete_comments(comments)
+        self.message_user(request, f'Удалено: {deleted}')
+        return None
+
+    def delete_queryset(self, request, queryset):
+        """Удаляет выбранные комментарии одним запросом."""
+        moderation.delete_comments(queryset)
@@ -0,0 +1,59 @@
+"""
+Асинхронные варианты представлений для ASGI.
+
+В Django 3.2 нет асинхронного ORM и асинхронной отрисовки шаблонов,
+поэтому запросы к базе и отрисовка выполняются одним вызовом
+sync_to_async. Закешированные страницы анонимных посетителей отдаются
+прямо в цикле событий, не занимая поток. Лента, страница поста
+и профиль подключаются в асинхронном варианте при BLOG_ASYNC_VIEWS.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from metrics.middleware import measured, render_measured
+from .cache import page_cache_key
+from .mixins import AnonymousPageCacheMixin
+
+
+def is_anonymous_get(request):
+    """GET без сессии: пользователь анонимный, база не нужна."""
+    return (
+        request.method == 'GET'
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def as_async_view(view_class, **initkwargs):
+    """Асинхронное представление поверх синхронного класса."""
+    sync_view = view_class.as_view(**initkwargs)
+    page_cached = issubclass(view_class, AnonymousPageCacheMixin)
+
+    @measured
+    def respond(request, *args, **kwargs):
+        response = sync_view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            render_measured(response)
+        return response
+
+    async def view(request, *args, **kwargs):
+        if page_cached and is_anonymous_get(request):
+            instance = view_class(**initkwargs)
+            instance.setup(request, *args, **kwargs)
+            response = cache.get(
+                page_cache_key(request, instance.get_page_cache_versions())
+            )
+            if response is not None:
+                return response
+        return await sync_to_async(respond)(request, *args, **kwargs)
+
+    view.view_class = view_class
+    view.view_initkwargs = initkwargs
+    return view
+
+
+def as_configured_view(view_class, **initkwargs):
+    """Асинхронный вариант при BLOG_ASYNC_VIEWS, иначе обычный."""
+    if getattr(settings, 'BLOG_ASYNC_VIEWS', False):
+        return as_async_view(view_class, **initkwargs)
+    return view_class.as_view(**initkwargs)
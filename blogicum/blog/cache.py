@@ -0,0 +1,103 @@
+"""
+Кеш отрисованных карточек и страниц.
+
+Закешированные данные привязаны к версиям: версия поста меняется при
+изменении самого поста, его категории, локации, автора или комментариев.
+Версии ленты и страницы категории меняются вместе с версиями постов,
+которые в них выводятся, поэтому правка поста не сбрасывает страницы
+других категорий. Сброс версии делает старые записи недоступными без
+перебора ключей.
+"""
+import hashlib
+import math
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .constants import PAGE_CACHE_TIMEOUT
+from .models import Category, Post
+
+VERSION_KEY = 'version:{name}'
+POST_CARD_KEY = 'post_card:{pk}:{version}'
+PAGE_KEY = 'page:{path}:{versions}'
+FEED_VERSION = 'feed'
+PAGES_VERSION = 'pages'
+
+
+def post_version(pk):
+    return f'post:{pk}'
+
+
+def category_version(slug):
+    return f'category:{slug}'
+
+
+def get_versions(names):
+    """Возвращает текущие версии, создавая недостающие."""
+    keys = {VERSION_KEY.format(name=name): name for name in names}
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(names):
+    """Сбрасывает версии, старые записи больше не читаются."""
+    cache.delete_many([VERSION_KEY.format(name=name) for name in names])
+
+
+def post_card_cache_key(pk):
+    """Ключ фрагмента карточки для текущей версии поста."""
+    version, = get_versions([post_version(pk)])
+    return POST_CARD_KEY.format(pk=pk, version=version)
+
+
+def page_cache_key(request, version_names):
+    """Ключ страницы для текущих версий её зависимостей."""
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return PAGE_KEY.format(
+        path=path, versions='.'.join(get_versions(version_names))
+    )
+
+
+def invalidate_posts(post_ids, category_ids=()):
+    """
+    Сбрасывает карточки и страницы постов и списки, где они выводятся.
+
+    Сбрасываются лента, страницы категорий постов и категорий
+    category_ids — например, прежней категории перенесённого поста.
+    """
+    post_ids = list(post_ids)
+    category_ids = [pk for pk in category_ids if pk is not None]
+    names = [post_version(pk) for pk in post_ids]
+    if post_ids:
+        names.append(FEED_VERSION)
+    if post_ids or category_ids:
+        slugs = Category.objects.filter(
+            Q(pk__in=category_ids) | Q(posts__pk__in=post_ids)
+        ).values_list('slug', flat=True).distinct()
+        names.extend(map(category_version, slugs))
+    bump_versions(names)
+
+
+def feed_cache_timeout():
+    """
+    Время жизни страницы ленты в секундах.
+
+    Страница устаревает не позже момента выхода ближайшей отложенной
+    публикации.
+    """
+    now = timezone.now()
+    next_pub_date = Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=now,
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    if next_pub_date is None:
+        return PAGE_CACHE_TIMEOUT
+    seconds = math.ceil((next_pub_date - now).total_seconds())
+    return min(PAGE_CACHE_TIMEOUT, seconds)
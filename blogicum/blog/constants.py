@@ -1,2 +1,20 @@
 CHAR_FIELD_MAX_LEN = 256
 POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 20
+CURSOR_QUERY_PARAM = 'cursor'
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+SEARCH_TITLE_WEIGHT = 3
+SEARCH_TEXT_WEIGHT = 1
+SEARCH_COMMENT_WEIGHT = 1
+SEARCH_QUERY_PARAM = 'q'
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_PROCESSING_KEY = 'image_processing:{name}'
+IMAGE_PROCESSING_TIMEOUT = 60 * 60
+EXIF_ORIENTATION = 0x0112
+PAGE_CACHE_TIMEOUT = 60 * 10
+FEED_SYNC_BATCH_SIZE = 500
+EXPORT_CHUNK_SIZE = 2000
+ESTIMATED_COUNT_THRESHOLD = 10_000
+ADMIN_INLINE_PER_PAGE = 20
+COMMENT_DELETE_BATCH_SIZE = 1000
@@ -0,0 +1,55 @@
+"""
+Потоковая выгрузка опубликованных постов и комментариев в NDJSON.
+
+Строки выбираются по возрастанию id через iterator(chunk_size), поэтому
+память не зависит от размера таблицы. Выгрузку можно продолжить
+с места обрыва, передав id последней полученной строки.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .constants import EXPORT_CHUNK_SIZE
+from .models import Comment, Post
+
+POST_FIELDS = (
+    'id',
+    'title',
+    'text',
+    'pub_date',
+    'created_at',
+    'author__username',
+    'category__slug',
+    'location__name',
+    'image',
+    'comment_count',
+)
+COMMENT_FIELDS = (
+    'id',
+    'post_id',
+    'author__username',
+    'text',
+    'created_at',
+)
+DATASETS = {
+    'posts': lambda: Post.objects.filter(is_visible=True).values(
+        *POST_FIELDS
+    ),
+    'comments': lambda: Comment.objects.published().filter(
+        post__is_visible=True
+    ).values(*COMMENT_FIELDS),
+}
+
+
+def rows(dataset, after=0, chunk_size=EXPORT_CHUNK_SIZE):
+    """Строки набора dataset с id больше after по возрастанию id."""
+    return (
+        DATASETS[dataset]()
+        .filter(pk__gt=after)
+        .order_by('pk')
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def to_ndjson(row):
+    return json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
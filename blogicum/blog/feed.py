@@ -0,0 +1,139 @@
+"""
+Денормализованная лента FeedEntry.
+
+Таблица содержит по строке на каждый видимый пост. Строки пересобираются
+по id постов при изменении постов и их видимости, а переименования
+авторов, категорий и локаций и счётчики комментариев переносятся
+в таблицу одним UPDATE. Команда rebuild_feed перестраивает таблицу
+целиком, check_feed сверяет её с постами.
+"""
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from .constants import FEED_SYNC_BATCH_SIZE
+from .models import FeedEntry, Post
+
+
+def build_entry(post):
+    """Строка ленты для поста с подгруженными связанными моделями."""
+    location = post.location
+    return FeedEntry(
+        post_id=post.pk,
+        title=post.title,
+        text=post.text,
+        image=post.image.name,
+        image_variants=post.image_variants,
+        pub_date=post.pub_date,
+        author_username=post.author.username,
+        category_slug=post.category.slug,
+        category_title=post.category.title,
+        location_name=(
+            location.name if location and location.is_published else ''
+        ),
+        comment_count=post.comment_count,
+    )
+
+
+def _batches(iterable):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, FEED_SYNC_BATCH_SIZE)):
+        yield batch
+
+
+def sync_posts(post_ids):
+    """Пересобирает строки ленты указанных постов."""
+    for batch in _batches(post_ids):
+        with transaction.atomic():
+            FeedEntry.objects.filter(pk__in=batch).delete()
+            FeedEntry.objects.bulk_create(
+                build_entry(post)
+                for post in Post.published.filter(pk__in=batch)
+            )
+
+
+def rebuild():
+    """Перестраивает ленту целиком. Возвращает число строк."""
+    total = 0
+    with transaction.atomic():
+        FeedEntry.objects.all().delete()
+        posts = Post.published.order_by('pk').iterator(
+            chunk_size=FEED_SYNC_BATCH_SIZE
+        )
+        for batch in _batches(posts):
+            FeedEntry.objects.bulk_create(map(build_entry, batch))
+            total += len(batch)
+    return total
+
+
+def rename_author(user):
+    FeedEntry.objects.filter(post__author_id=user.pk).update(
+        author_username=user.username
+    )
+
+
+def rename_category(category):
+    FeedEntry.objects.filter(post__category_id=category.pk).update(
+        category_slug=category.slug, category_title=category.title
+    )
+
+
+def rename_location(location):
+    FeedEntry.objects.filter(post__location_id=location.pk).update(
+        location_name=location.name if location.is_published else ''
+    )
+
+
+def clear_location(location):
+    FeedEntry.objects.filter(post__location_id=location.pk).update(
+        location_name=''
+    )
+
+
+def copy_comment_counts(entries=None):
+    """Переносит в ленту сохранённые счётчики комментариев постов."""
+    if entries is None:
+        entries = FeedEntry.objects.all()
+    return entries.update(comment_count=Subquery(
+        Post.objects.filter(pk=OuterRef('pk')).values('comment_count')
+    ))
+
+
+def _row(entry):
+    return tuple(
+        field.value_to_string(entry)
+        for field in FeedEntry._meta.concrete_fields
+    )
+
+
+def check():
+    """
+    Сверяет ленту с постами.
+
+    Возвращает три списка id: видимые посты без строки в ленте, строки
+    невидимых постов и строки с устаревшими данными.
+    """
+    expected = (
+        build_entry(post)
+        for post in Post.published.order_by('pk').iterator(
+            chunk_size=FEED_SYNC_BATCH_SIZE
+        )
+    )
+    actual = FeedEntry.objects.order_by('pk').iterator(
+        chunk_size=FEED_SYNC_BATCH_SIZE
+    )
+    missing, stale, outdated = [], [], []
+    want, have = next(expected, None), next(actual, None)
+    while want is not None or have is not None:
+        if have is None or (want is not None and want.pk < have.pk):
+            missing.append(want.pk)
+            want = next(expected, None)
+        elif want is None or have.pk < want.pk:
+            stale.append(have.pk)
+            have = next(actual, None)
+        else:
+            if _row(want) != _row(have):
+                outdated.append(want.pk)
+            want, have = next(expected, None), next(actual, None)
+    return missing, stale, outdated
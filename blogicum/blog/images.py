@@ -0,0 +1,127 @@
+"""Уменьшенные копии изображений постов для srcset."""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .constants import (
+    EXIF_ORIENTATION, IMAGE_VARIANT_QUALITY, IMAGE_VARIANT_WIDTHS
+)
+
+
+def variant_name(name, width):
+    """Имя копии шириной width рядом с оригиналом."""
+    root, _ = os.path.splitext(name)
+    return f'{root}_{width}w.jpg'
+
+
+def _render_variant(image, width):
+    variant = image.copy()
+    variant.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+    buffer = BytesIO()
+    variant.save(
+        buffer, 'JPEG', quality=IMAGE_VARIANT_QUALITY, optimize=True
+    )
+    return ContentFile(buffer.getvalue()), variant.width
+
+
+def _stored_width(storage, name):
+    with storage.open(name) as variant:
+        return Image.open(variant).width
+
+
+def create_variants(field_file):
+    """
+    Создаёт недостающие копии изображения и возвращает их описание.
+
+    Самая маленькая копия создаётся всегда, копии не шире оригинала
+    не создаются. Описание хранит имя оригинала и список пар
+    (имя копии, настоящая ширина) — копия меньше оригинала не
+    растягивается, так что её ширина может быть меньше заявленной.
+    Метаданные EXIF в копии не переносятся.
+    """
+    storage, name = field_file.storage, field_file.name
+    smallest, *larger = sorted(IMAGE_VARIANT_WIDTHS)
+    variants = []
+    with storage.open(name) as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image = image.convert('RGB')
+        for width in (smallest, *(w for w in larger if w < image.width)):
+            target = variant_name(name, width)
+            if storage.exists(target):
+                real_width = _stored_width(storage, target)
+            else:
+                content, real_width = _render_variant(image, width)
+                storage.save(target, content)
+            variants.append((target, real_width))
+    return {'source': name, 'variants': variants}
+
+
+def _without_exif(image):
+    """Метаданные EXIF, в которых оставлена только ориентация."""
+    orientation = image.getexif().get(EXIF_ORIENTATION)
+    if orientation is None:
+        return b''
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    return exif
+
+
+def _replace(storage, name, content):
+    """
+    Подменяет файл хранилища без окна, в котором его нет.
+
+    Новое содержимое пишется под свободным именем рядом с оригиналом
+    и атомарно переименовывается поверх него.
+    """
+    temp = storage.save(name, content)
+    try:
+        os.replace(storage.path(temp), storage.path(name))
+    except Exception:
+        storage.delete(temp)
+        raise
+
+
+def strip_exif(field_file):
+    """
+    Перезаписывает оригинал без метаданных EXIF, если они есть.
+
+    Пиксели не пересчитываются: ориентация остаётся тегом, JPEG
+    сохраняется с исходными таблицами квантования, профиль ICC
+    сохраняется. Хранилища без локальных путей не поддерживаются,
+    в них оригинал остаётся как есть, а копии и так без EXIF.
+    """
+    storage, name = field_file.storage, field_file.name
+    try:
+        storage.path(name)
+    except NotImplementedError:
+        return
+    with storage.open(name) as original:
+        image = Image.open(original)
+        exif = image.getexif()
+        if not exif or set(exif) == {EXIF_ORIENTATION}:
+            return
+        options = {'icc_profile': image.info.get('icc_profile')}
+        if image.format == 'JPEG':
+            options.update(quality='keep', subsampling='keep')
+        buffer = BytesIO()
+        image.save(
+            buffer, image.format, exif=_without_exif(image), **options
+        )
+    _replace(storage, name, ContentFile(buffer.getvalue()))
+
+
+def get_variants(field_file, variants):
+    """
+    Возвращает список (url, ширина) копий по описанию из create_variants.
+
+    Пустой список означает, что изображение ещё не обработано или
+    описание осталось от прежнего изображения.
+    """
+    if not field_file or variants.get('source') != field_file.name:
+        return []
+    storage = field_file.storage
+    return [
+        (storage.url(name), width) for name, width in variants['variants']
+    ]
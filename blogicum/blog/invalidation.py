@@ -0,0 +1,103 @@
+"""
+Каскадная инвалидация при изменении категорий и локаций.
+
+Категория и локация выводятся в карточках всех своих постов, а признак
+публикации категории определяет видимость постов в ленте. При сохранении
+отслеживаемые поля сравниваются с прежними значениями: если они не
+менялись, посты не затрагиваются. Иначе затронутые посты выбираются
+одним запросом, и сбрасываются только их карточки, страницы и строки
+ленты, а не весь кеш.
+"""
+from . import feed, scheduler
+from .cache import invalidate_posts
+from .models import Category, Location, Post
+
+TRACKED_FIELDS = {
+    Category: ('is_published', 'slug', 'title'),
+    Location: ('is_published', 'name'),
+}
+
+
+def remember_state(instance):
+    """Запоминает отслеживаемые поля в том виде, в каком они в базе."""
+    model = type(instance)
+    instance._tracked_state = model.objects.filter(
+        pk=instance.pk
+    ).values(*TRACKED_FIELDS[model]).first()
+
+
+def changed_fields(instance):
+    """Отслеживаемые поля, изменившиеся с момента remember_state."""
+    previous = getattr(instance, '_tracked_state', None)
+    if previous is None:
+        return set()
+    return {
+        name for name, value in previous.items()
+        if getattr(instance, name) != value
+    }
+
+
+def categories_changed(category_ids, fields):
+    """
+    Переносит изменения категорий в посты, ленту и кеш.
+
+    Если менялся признак публикации, пересчитывает видимость постов.
+    Возвращает id затронутых постов.
+    """
+    rows = list(
+        Post.objects.filter(category_id__in=category_ids)
+        .with_expected_visibility()
+        .values_list('pk', 'is_visible', 'expected_visibility')
+    )
+    if 'is_published' in fields:
+        changes = {
+            pk: expected for pk, visible, expected in rows
+            if visible != expected
+        }
+        Post.objects.apply_visibility(changes)
+        feed.sync_posts(changes)
+        scheduler.schedule_next_publication()
+    if fields & {'slug', 'title'}:
+        for category in Category.objects.filter(pk__in=category_ids):
+            feed.rename_category(category)
+    post_ids = [pk for pk, _, _ in rows]
+    invalidate_posts(post_ids, category_ids)
+    return post_ids
+
+
+def locations_changed(location_ids, fields):
+    """
+    Переносит изменения локаций в ленту и кеш.
+
+    Возвращает id затронутых постов.
+    """
+    post_ids = list(
+        Post.objects.filter(
+            location_id__in=location_ids
+        ).values_list('pk', flat=True)
+    )
+    for location in Location.objects.filter(pk__in=location_ids):
+        feed.rename_location(location)
+    invalidate_posts(post_ids)
+    return post_ids
+
+
+def set_published(queryset, is_published):
+    """
+    Публикует или снимает с публикации категории или локации одним UPDATE.
+
+    Возвращает число изменённых объектов.
+    """
+    model = queryset.model
+    object_ids = list(
+        queryset.exclude(
+            is_published=is_published
+        ).values_list('pk', flat=True)
+    )
+    model.objects.filter(pk__in=object_ids).update(is_published=is_published)
+    if object_ids:
+        if model is Category:
+            categories_changed(object_ids, {'is_published'})
+        else:
+            locations_changed(object_ids, {'is_published'})
+    return len(object_ids)
@@ -0,0 +1,168 @@
+"""
+Потоковая загрузка фикстур в формате dumpdata.
+
+Файл читается кусками, объекты разбираются по одному, поэтому память не
+зависит от размера файла. Объекты копятся в пачки по моделям и
+вставляются одним INSERT на пачку без сигналов и валидации, как при
+loaddata. Перед вставкой пачки вставляются накопленные пачки моделей,
+на которые она ссылается. Производные данные — видимость постов,
+счётчики комментариев, лента и поисковый индекс — пересчитываются
+в конце одним проходом, после чего ставится тик планировщика для
+отложенных постов и сбрасывается кеш загруженных постов и категорий.
+"""
+import json
+import time
+from itertools import islice
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from . import feed, scheduler, search
+from .cache import invalidate_posts
+from .models import Category, Post
+
+LOAD_ORDER = (
+    'blog.category',
+    'blog.location',
+    'auth.user',
+    'blog.post',
+    'blog.comment',
+)
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 2000
+
+
+def iter_objects(stream, chunk_size=CHUNK_SIZE):
+    """
+    Выдаёт объекты фикстуры по одному.
+
+    Понимает JSON-массив dumpdata и файлы с объектом на строку.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    exhausted = False
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,[]':
+            position += 1
+        if position < len(buffer):
+            try:
+                obj, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                yield obj
+                position = end
+                continue
+        if exhausted:
+            return
+        chunk = stream.read(chunk_size)
+        exhausted = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+class BulkLoader:
+    """Пачки объектов по моделям с учётом порядка внешних ключей."""
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.models = [apps.get_model(label) for label in LOAD_ORDER]
+        self.batches = {model: [] for model in self.models}
+        self.m2m = {model: [] for model in self.models}
+        self.counts = {model: 0 for model in self.models}
+        self.skipped = {}
+        # id загруженных постов и категорий для сброса кеша.
+        self.loaded = {Category: [], Post: []}
+
+    def add(self, data):
+        label = data['model'].lower()
+        if label not in LOAD_ORDER:
+            self.skipped[label] = self.skipped.get(label, 0) + 1
+            return
+        deserialized, = serializers.deserialize(
+            'python', [data], ignorenonexistent=True
+        )
+        model = type(deserialized.object)
+        self.batches[model].append(deserialized.object)
+        m2m_data = {
+            name: values
+            for name, values in deserialized.m2m_data.items() if values
+        }
+        if m2m_data:
+            self.m2m[model].append((deserialized.object.pk, m2m_data))
+        if len(self.batches[model]) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        """Вставляет пачку модели, а перед ней — пачки её зависимостей."""
+        for dependency in self.models[:self.models.index(model)]:
+            if self.batches[dependency]:
+                self.flush(dependency)
+        batch, self.batches[model] = self.batches[model], []
+        if not batch:
+            return
+        # raw=True, как у loaddata, который сохраняет объекты через тот же
+        # Manager._insert: значения auto_now_add берутся из фикстуры.
+        # bulk_create заменил бы их текущим временем.
+        fields = model._meta.concrete_fields
+        connection = connections[DEFAULT_DB_ALIAS]
+        size = connection.ops.bulk_batch_size(fields, batch)
+        for start in range(0, len(batch), size):
+            model._base_manager._insert(
+                batch[start:start + size], fields=fields, raw=True
+            )
+        self.counts[model] += len(batch)
+        if model in self.loaded:
+            self.loaded[model].extend(obj.pk for obj in batch)
+        self.flush_m2m(model)
+
+    def flush_m2m(self, model):
+        rows, self.m2m[model] = self.m2m[model], []
+        for pk, m2m_data in rows:
+            for name, values in m2m_data.items():
+                field = model._meta.get_field(name)
+                through = field.remote_field.through
+                source = field.m2m_field_name()
+                target = field.m2m_reverse_field_name()
+                through._base_manager.bulk_create(
+                    through(**{f'{source}_id': pk, f'{target}_id': value})
+                    for value in values
+                )
+
+    def finish(self):
+        for model in self.models:
+            self.flush(model)
+        connection = connections[DEFAULT_DB_ALIAS]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), self.models
+            ):
+                cursor.execute(sql)
+
+
+def load(stream, batch_size=BATCH_SIZE):
+    """
+    Загружает фикстуру из потока.
+
+    Возвращает ({модель: строк}, {пропущенная модель: объектов}, секунд).
+    """
+    start = time.perf_counter()
+    loader = BulkLoader(batch_size)
+    with transaction.atomic():
+        for data in iter_objects(stream):
+            loader.add(data)
+        loader.finish()
+        Post.objects.refresh_visibility()
+        Post.objects.recount_comments()
+    feed.rebuild()
+    search.rebuild_index()
+    scheduler.schedule_next_publication()
+    invalidate_posts([], loader.loaded[Category])
+    post_ids = iter(loader.loaded[Post])
+    while batch := list(islice(post_ids, batch_size)):
+        invalidate_posts(batch)
+    return loader.counts, loader.skipped, time.perf_counter() - start
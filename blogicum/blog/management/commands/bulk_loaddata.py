@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from blog.loader import BATCH_SIZE, load
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает фикстуру dumpdata пачками bulk-вставок. '
+        'Загружаются категории, локации, пользователи, посты '
+        'и комментарии, остальные модели пропускаются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к JSON-файлу фикстуры.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Сколько объектов модели вставлять за раз.',
+        )
+
+    def handle(self, *args, **options):
+        with open(options['fixture'], encoding='utf-8') as stream:
+            counts, skipped, seconds = load(stream, options['batch_size'])
+        total = sum(counts.values())
+        for model, rows in counts.items():
+            self.stdout.write(f'{model._meta.label}: {rows}')
+        for label, rows in skipped.items():
+            self.stdout.write(f'{label}: {rows} пропущено')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {seconds:.1f} с '
+            f'({total / seconds:.0f} строк/с)'
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.feed import check, sync_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет денормализованную ленту с постами. '
+        'С --fix пересобирает расходящиеся строки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Исправить найденные расхождения.',
+        )
+
+    def handle(self, *args, **options):
+        missing, stale, outdated = check()
+        for label, post_ids in (
+            ('Нет в ленте', missing),
+            ('Лишние в ленте', stale),
+            ('Устарели', outdated),
+        ):
+            if post_ids:
+                self.stdout.write(f'{label}: {len(post_ids)} {post_ids}')
+        broken = missing + stale + outdated
+        if not broken:
+            self.stdout.write(self.style.SUCCESS('Лента согласована'))
+        elif options['fix']:
+            sync_posts(broken)
+            self.stdout.write(
+                self.style.SUCCESS(f'Исправлено строк: {len(broken)}')
+            )
+        else:
+            raise CommandError(f'Расхождений в ленте: {len(broken)}')
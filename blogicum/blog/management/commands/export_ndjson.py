@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.export import DATASETS, rows, to_ndjson
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает опубликованные посты или комментарии в NDJSON. '
+        'С --checkpoint продолжает с последней выгруженной строки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=tuple(DATASETS))
+        parser.add_argument(
+            '--output',
+            help='Файл выгрузки, по умолчанию стандартный вывод.',
+        )
+        parser.add_argument(
+            '--after',
+            type=int,
+            default=0,
+            help='Выгрузить строки с id больше указанного.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help=(
+                'Файл с id последней выгруженной строки: читается при '
+                'запуске и обновляется после каждой пачки.'
+            ),
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Сколько строк читать из базы за раз.',
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint'] and Path(options['checkpoint'])
+        after = options['after']
+        resume = False
+        if checkpoint and checkpoint.exists():
+            after = int(checkpoint.read_text() or 0)
+            resume = bool(after)
+        # Файл дописывается только при продолжении по контрольной точке,
+        # иначе повторный запуск с --after задвоил бы строки.
+        output = (
+            open(options['output'], 'a' if resume else 'w', encoding='utf-8')
+            if options['output'] else self.stdout
+        )
+        exported = 0
+        try:
+            for row in rows(options['dataset'], after, options['chunk_size']):
+                output.write(to_ndjson(row))
+                exported += 1
+                if checkpoint and exported % options['chunk_size'] == 0:
+                    output.flush()
+                    checkpoint.write_text(str(row['id']))
+            if checkpoint and exported:
+                output.flush()
+                checkpoint.write_text(str(row['id']))
+        finally:
+            if output is not self.stdout:
+                output.close()
+        self.stderr.write(self.style.SUCCESS(f'Выгружено строк: {exported}'))
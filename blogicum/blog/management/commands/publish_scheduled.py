@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.scheduler import publish_due_posts, schedule_next_publication
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает в ленте посты, время публикации которых наступило. '
+        'Можно запускать по cron, если worker очереди задач не запущен.'
+    )
+
+    def handle(self, *args, **options):
+        post_ids = publish_due_posts()
+        schedule_next_publication()
+        self.stdout.write(
+            self.style.SUCCESS(f'Опубликовано постов: {len(post_ids)}')
+        )
@@ -0,0 +1,60 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from blog.models import User
+from blog.moderation import purge_comments
+
+
+def _start_of_day(value):
+    day = parse_date(value)
+    if day is None:
+        raise CommandError(f'Неверная дата: {value}. Ожидается ГГГГ-ММ-ДД.')
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет комментарии авторов, постов или за период одним '
+        'запросом и пересчитывает счётчики комментариев постов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--author',
+            action='append',
+            help='Имя пользователя автора; можно указать несколько раз.',
+        )
+        parser.add_argument(
+            '--post',
+            action='append',
+            type=int,
+            help='id поста; можно указать несколько раз.',
+        )
+        parser.add_argument(
+            '--since',
+            help='Удалять комментарии начиная с даты ГГГГ-ММ-ДД.',
+        )
+        parser.add_argument(
+            '--until',
+            help='Удалять комментарии до даты ГГГГ-ММ-ДД, не включая её.',
+        )
+
+    def handle(self, *args, **options):
+        authors = None
+        if options['author']:
+            authors = User.objects.filter(username__in=options['author'])
+        try:
+            deleted = purge_comments(
+                authors=authors,
+                posts=options['post'],
+                since=options['since'] and _start_of_day(options['since']),
+                until=options['until'] and _start_of_day(options['until']),
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено комментариев: {deleted}')
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.feed import rebuild
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает видимость постов и перестраивает ленту. '
+        'Нужен после loaddata и ручных правок базы.'
+    )
+
+    def handle(self, *args, **options):
+        Post.objects.refresh_visibility()
+        total = rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Постов в ленте: {total}')
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает поисковый индекс постов. '
+        'Нужен после loaddata и на базах без FTS5.'
+    )
+
+    def handle(self, *args, **options):
+        total = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано постов: {total}')
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog.feed import copy_comment_counts, sync_posts
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает видимость и количество комментариев у постов. '
+        'Нужен после loaddata и ручных правок базы.'
+    )
+
+    def handle(self, *args, **options):
+        sync_posts(Post.objects.refresh_visibility())
+        updated = Post.objects.recount_comments()
+        copy_comment_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано постов: {updated}')
+        )
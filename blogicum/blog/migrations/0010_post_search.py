@@ -0,0 +1,60 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:17
+
+from django.db import OperationalError, migrations, models
+import django.db.models.deletion
+
+
+def create_fts_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts '
+                'USING fts5(title, text, comments)'
+            )
+        except OperationalError:
+            # SQLite собран без FTS5, поиск будет работать через
+            # таблицу PostSearchToken.
+            return
+        cursor.execute(
+            'INSERT INTO blog_post_fts (rowid, title, text, comments) '
+            'SELECT id, title, text, ('
+            '    SELECT group_concat(text, char(10)) FROM blog_comment'
+            '    WHERE blog_comment.post_id = blog_post.id'
+            ') FROM blog_post'
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=256, verbose_name='Слово')),
+                ('weight', models.PositiveIntegerField(default=1, verbose_name='Вес')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='blog.post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'слово поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postsearchtoken',
+            constraint=models.UniqueConstraint(fields=('token', 'post'), name='unique_post_search_token'),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = Post.objects.filter(is_visible=True).select_related(
+        'author', 'category', 'location'
+    )
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(
+                post_id=post.pk,
+                title=post.title,
+                text=post.text,
+                image=post.image.name,
+                pub_date=post.pub_date,
+                author_username=post.author.username,
+                category_slug=post.category.slug,
+                category_title=post.category.title,
+                location_name=(
+                    post.location.name
+                    if post.location and post.location.is_published
+                    else ''
+                ),
+                comment_count=post.comment_count,
+            )
+            for post in posts.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Пост')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('image', models.ImageField(blank=True, upload_to='birthdays_images', verbose_name='Изображение')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('author_username', models.CharField(max_length=150, verbose_name='Автор публикации')),
+                ('category_slug', models.SlugField(db_index=False, verbose_name='Идентификатор категории')),
+                ('category_title', models.CharField(max_length=256, verbose_name='Категория')),
+                ('location_name', models.CharField(blank=True, help_text='Пусто, если локации нет или она снята с публикации.', max_length=256, verbose_name='Местоположение')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Количество комментариев')),
+            ],
+            options={
+                'verbose_name': 'строка ленты',
+                'verbose_name_plural': 'Лента',
+                'ordering': ('-pub_date',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date', '-post'], name='feed_entry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['category_slug', '-pub_date', '-post'], name='feed_entry_category_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_feed_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='is_published',
+            field=models.BooleanField(default=True, help_text='Снимите галочку, чтобы скрыть комментарий.', verbose_name='Опубликовано'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Min
+from django.utils import timezone
+
+PUBLISH_TASK = 'blog.tasks.publish_scheduled_posts'
+
+
+def schedule_publication(apps, schema_editor):
+    """Ставит тик планировщика для постов, отложенных до обновления."""
+    Post = apps.get_model('blog', 'Post')
+    Task = apps.get_model('tasks', 'Task')
+    run_after = Post.objects.filter(
+        is_published=True,
+        is_visible=False,
+        category__is_published=True,
+        pub_date__gt=timezone.now(),
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    if run_after is None:
+        return
+    pending = Task.objects.filter(
+        name=PUBLISH_TASK, kwargs={}, status='pending'
+    )
+    if pending.filter(run_after__lte=run_after).exists():
+        return
+    pending.delete()
+    Task.objects.create(name=PUBLISH_TASK, kwargs={}, run_after=run_after)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_comment_options'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(schedule_publication, migrations.RunPython.noop),
+    ]
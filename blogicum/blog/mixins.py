@@ -1,18 +1,34 @@
+from http import HTTPStatus
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
 from django.urls import reverse_lazy
 
+from .cache import FEED_VERSION, page_cache_key
+from .constants import CURSOR_QUERY_PARAM, PAGE_CACHE_TIMEOUT
+from .paginators import CursorPaginator
+
 User = get_user_model()
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
     """Проверка авторства."""
 
+    def get_object(self, queryset=None):
+        """Запоминает объект, чтобы не запрашивать его повторно."""
+        if not hasattr(self, '_author_object'):
+            self._author_object = super().get_object(queryset)
+        return self._author_object
+
     def test_func(self):
+        if not self.request.user.is_authenticated:
+            return False
         object = self.get_object()
-        if type(object) == User:
-            return object == self.request.user
-        return object.author == self.request.user
+        if isinstance(object, User):
+            return object.pk == self.request.user.pk
+        return object.author_id == self.request.user.pk
 
 
 class UserRedirectMixin:
@@ -30,3 +46,67 @@ class UserProfileMixin:
     model = User
     slug_url_kwarg = 'username'
     slug_field = 'username'
+
+
+class CursorPaginationMixin:
+    """
+    Курсорная пагинация для ListView.
+
+    Включается настройкой BLOG_CURSOR_PAGINATION или наличием курсора
+    в параметрах запроса.
+    """
+
+    cursor_paginator_class = CursorPaginator
+
+    def use_cursor_pagination(self):
+        return (
+            getattr(settings, 'BLOG_CURSOR_PAGINATION', False)
+            or CURSOR_QUERY_PARAM in self.request.GET
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        """Возвращает страницу по курсору вместо номера страницы."""
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.cursor_paginator_class(queryset, page_size)
+        page = paginator.page(self.request.GET.get(CURSOR_QUERY_PARAM))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AnonymousPageCacheMixin:
+    """
+    Кеширует страницу целиком для анонимных пользователей.
+
+    Ключ страницы включает версии из get_page_cache_versions(), поэтому
+    изменения моделей сбрасывают её без явного удаления.
+    """
+
+    page_cache_versions = (FEED_VERSION,)
+
+    def get_page_cache_versions(self):
+        return self.page_cache_versions
+
+    def get_page_cache_timeout(self):
+        return PAGE_CACHE_TIMEOUT
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request, self.get_page_cache_versions())
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != HTTPStatus.OK or response.cookies:
+            return response
+        timeout = self.get_page_cache_timeout()
+
+        def store(rendered):
+            if timeout > 0 and not request.META.get('CSRF_COOKIE_USED'):
+                cache.set(key, rendered, timeout)
+
+        if callable(getattr(response, 'render', None)):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
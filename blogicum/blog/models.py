@@ -1,7 +1,12 @@
 """Модели для блога"""
+from types import SimpleNamespace
+
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.db.models import Count
+from django.db.models import (
+    Case, Count, F, OuterRef, Q, Subquery, Value, When
+)
+from django.db.models.functions import Coalesce, Greatest
 from django.urls import reverse
 from django.utils import timezone
 
@@ -22,16 +27,66 @@ class PostQuerySet(models.QuerySet):
 
     def published(self):
         """Фильтрует посты"""
-        return self.filter(
-            is_published=True,
-            pub_date__lte=timezone.now(),
-            category__is_published=True
+        return self.filter(is_visible=True)
+
+    def with_expected_visibility(self):
+        """Добавляет expected_visibility — каким должен быть is_visible."""
+        return self.annotate(expected_visibility=Case(
+            When(
+                Q(
+                    is_published=True,
+                    pub_date__lte=timezone.now(),
+                    category__is_published=True,
+                ),
+                then=Value(True),
+            ),
+            default=Value(False),
+            output_field=models.BooleanField(),
+        ))
+
+    def refresh_visibility(self):
+        """
+        Пересчитывает признак is_visible по публикации, дате и категории.
+
+        Возвращает id постов, у которых признак изменился.
+        """
+        changes = dict(
+            self.with_expected_visibility()
+            .exclude(expected_visibility=F('is_visible'))
+            .values_list('pk', 'expected_visibility')
+        )
+        return Post.objects.apply_visibility(changes)
+
+    def apply_visibility(self, changes):
+        """
+        Сохраняет признаки из словаря {id поста: is_visible}.
+
+        Возвращает id постов.
+        """
+        for value in (True, False):
+            post_ids = [
+                pk for pk, visible in changes.items() if visible == value
+            ]
+            if post_ids:
+                self.filter(pk__in=post_ids).update(is_visible=value)
+        return list(changes)
+
+    def recount_comments(self):
+        """Пересчитывает сохранённое количество видимых комментариев."""
+        counts = (
+            Comment.objects.published().filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
         )
+        return self.update(comment_count=Coalesce(Subquery(counts), 0))
 
-    def with_annotate(self):
-        return self.annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
+    def shift_comment_count(self, delta):
+        """Сдвигает счётчик комментариев на delta одним UPDATE."""
+        return self.update(
+            comment_count=Greatest(F('comment_count') + delta, 0)
+        )
 
 
 class PublishedPostManager(models.Manager):
@@ -42,7 +97,6 @@ class PublishedPostManager(models.Manager):
             PostQuerySet(self.model)
             .with_related_data()
             .published()
-            .with_annotate()
         )
 
 
@@ -138,6 +192,26 @@ class Post(PublishedModel):
     image = models.ImageField(
         'Добавить изображение', upload_to='birthdays_images', blank=True
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии изображения',
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Виден в ленте',
+        help_text=(
+            'Пост опубликован, его категория опубликована '
+            'и время публикации наступило.'
+        )
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
 
     objects = PostQuerySet.as_manager()
     published = PublishedPostManager()
@@ -150,10 +224,52 @@ class Post(PublishedModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=Q(is_visible=True),
+                name='post_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=Q(is_visible=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('location', '-pub_date', '-id'),
+                condition=Q(is_visible=True),
+                name='post_location_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('pub_date',),
+                name='post_pub_date_idx',
+            ),
+        )
 
     def get_absolute_url(self):
         return reverse('post:post_detail', kwargs={'pk': self.pk})
 
+    def compute_visibility(self):
+        """Вычисляет is_visible по текущим полям поста."""
+        return bool(
+            self.is_published
+            and self.pub_date <= timezone.now()
+            and self.category is not None
+            and self.category.is_published
+        )
+
+
+class CommentQuerySet(models.QuerySet):
+    """QuerySet комментариев."""
+
+    def published(self):
+        """Комментарии, не скрытые модератором."""
+        return self.filter(is_published=True)
+
 
 class Comment(models.Model):
     """Модель комментария."""
@@ -174,6 +290,13 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         verbose_name='Автор'
     )
+    is_published = models.BooleanField(
+        default=True,
+        verbose_name='Опубликовано',
+        help_text='Снимите галочку, чтобы скрыть комментарий.'
+    )
+
+    objects = CommentQuerySet.as_manager()
 
     def __str__(self):
         return self.text
@@ -182,3 +305,143 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
+
+
+class PostSearchToken(models.Model):
+    """Слово поискового индекса поста, если база не поддерживает FTS5."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='search_tokens',
+        verbose_name='Пост'
+    )
+    token = models.CharField(
+        max_length=CHAR_FIELD_MAX_LEN,
+        verbose_name='Слово'
+    )
+    weight = models.PositiveIntegerField(
+        default=1,
+        verbose_name='Вес'
+    )
+
+    def __str__(self):
+        return self.token
+
+    class Meta:
+        verbose_name = 'слово поискового индекса'
+        verbose_name_plural = 'Поисковый индекс'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('token', 'post'),
+                name='unique_post_search_token',
+            ),
+        )
+
+
+class FeedEntry(models.Model):
+    """
+    Строка ленты: видимый пост вместе с данными связанных моделей.
+
+    Таблица поддерживается сигналами модуля blog.feed, чтобы лента
+    читалась из одной таблицы без соединений и агрегатов.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Пост'
+    )
+    title = models.CharField(
+        max_length=CHAR_FIELD_MAX_LEN,
+        verbose_name='Заголовок',
+    )
+    text = models.TextField(
+        verbose_name='Текст',
+    )
+    image = models.ImageField(
+        upload_to='birthdays_images',
+        blank=True,
+        verbose_name='Изображение'
+    )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Уменьшенные копии изображения',
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата и время публикации',
+    )
+    author_username = models.CharField(
+        max_length=150,
+        verbose_name='Автор публикации',
+    )
+    category_slug = models.SlugField(
+        db_index=False,
+        verbose_name='Идентификатор категории',
+    )
+    category_title = models.CharField(
+        max_length=CHAR_FIELD_MAX_LEN,
+        verbose_name='Категория',
+    )
+    location_name = models.CharField(
+        max_length=CHAR_FIELD_MAX_LEN,
+        blank=True,
+        verbose_name='Местоположение',
+        help_text='Пусто, если локации нет или она снята с публикации.'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество комментариев',
+    )
+
+    # В ленту попадают только опубликованные посты.
+    is_published = True
+
+    def __str__(self):
+        return self.title
+
+    class Meta:
+        verbose_name = 'строка ленты'
+        verbose_name_plural = 'Лента'
+        ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-post'),
+                name='feed_entry_idx',
+            ),
+            models.Index(
+                fields=('category_slug', '-pub_date', '-post'),
+                name='feed_entry_category_idx',
+            ),
+        )
+
+    @property
+    def id(self):
+        return self.post_id
+
+    @property
+    def author(self):
+        return SimpleNamespace(username=self.author_username)
+
+    @property
+    def category(self):
+        return SimpleNamespace(
+            slug=self.category_slug,
+            title=self.category_title,
+            is_published=True,
+        )
+
+    @property
+    def location(self):
+        if not self.location_name:
+            return None
+        return SimpleNamespace(name=self.location_name, is_published=True)
@@ -0,0 +1,103 @@
+"""
+Массовая модерация комментариев.
+
+Комментарии скрываются и публикуются одним UPDATE на всю выборку,
+а удаляются пачками через QuerySet.delete() с отключёнными
+обработчиками сигналов комментариев. Затем счётчики комментариев,
+лента и кеш затронутых постов обновляются одним проходом, а
+переиндексация постов ставится в очередь задач.
+"""
+from itertools import islice
+
+from django.db import transaction
+
+from . import feed, search
+from .cache import invalidate_posts
+from .constants import COMMENT_DELETE_BATCH_SIZE
+from .models import Comment, FeedEntry, Post
+from .signals import refreshing_posts
+from .tasks import reindex_post
+
+
+def _post_ids(queryset):
+    return list(
+        queryset.order_by().values_list('post_id', flat=True).distinct()
+    )
+
+
+def _own_queryset(queryset):
+    """Выборка без select_related и сортировки из админки."""
+    return Comment.objects.filter(pk__in=queryset.values('pk'))
+
+
+def refresh_posts(post_ids):
+    """Пересчитывает производные данные постов после модерации."""
+    if not post_ids:
+        return
+    posts = Post.objects.filter(pk__in=post_ids)
+    posts.recount_comments()
+    feed.copy_comment_counts(FeedEntry.objects.filter(pk__in=post_ids))
+    if search.search_comments():
+        for post_id in post_ids:
+            reindex_post.delay(unique=True, post_id=post_id)
+    invalidate_posts(post_ids)
+
+
+def set_published(queryset, is_published):
+    """
+    Скрывает или публикует комментарии одним UPDATE.
+
+    Возвращает число изменённых комментариев.
+    """
+    with transaction.atomic():
+        comments = _own_queryset(queryset).exclude(is_published=is_published)
+        post_ids = _post_ids(comments)
+        updated = comments.update(is_published=is_published)
+        refresh_posts(post_ids)
+    return updated
+
+
+def delete_comments(queryset):
+    """
+    Удаляет комментарии пачками через QuerySet.delete().
+
+    Обработчики сигналов комментариев на время удаления отключены,
+    их работу один раз делает refresh_posts. Возвращает число
+    удалённых комментариев.
+    """
+    deleted = 0
+    with transaction.atomic():
+        comments = _own_queryset(queryset)
+        post_ids = _post_ids(comments)
+        pks = iter(list(comments.values_list('pk', flat=True)))
+        with refreshing_posts(post_ids):
+            while batch := list(islice(pks, COMMENT_DELETE_BATCH_SIZE)):
+                deleted += Comment.objects.filter(pk__in=batch).delete()[0]
+        refresh_posts(post_ids)
+    return deleted
+
+
+def comments_to_purge(authors=None, posts=None, since=None, until=None):
+    """
+    Комментарии авторов, постов и за период.
+
+    Условия объединяются через И; хотя бы одно обязательно.
+    """
+    filters = {
+        'author__in': authors,
+        'post__in': posts,
+        'created_at__gte': since,
+        'created_at__lt': until,
+    }
+    filters = {
+        lookup: value for lookup, value in filters.items()
+        if value is not None
+    }
+    if not filters:
+        raise ValueError('Не задано ни одного условия удаления.')
+    return Comment.objects.filter(**filters)
+
+
+def purge_comments(**conditions):
+    """Удаляет комментарии по условиям comments_to_purge."""
+    return delete_comments(comments_to_purge(**conditions))
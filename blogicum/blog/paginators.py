@@ -0,0 +1,184 @@
+"""
+Пагинаторы блога.
+
+Курсорная пагинация по ключу (дата, id) для ленты и комментариев
+и пагинатор админки с оценкой числа строк вместо COUNT(*).
+"""
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from core.db import estimate_count
+from .constants import ESTIMATED_COUNT_THRESHOLD
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def encode_cursor(direction, obj, key_field='pub_date'):
+    """Упаковывает позицию объекта в непрозрачный токен."""
+    raw = f'{direction}|{getattr(obj, key_field).isoformat()}|{obj.pk}'
+    return urlsafe_base64_encode(force_bytes(raw))
+
+
+def decode_cursor(token):
+    """Распаковывает токен. Возвращает 404 если токен повреждён."""
+    try:
+        direction, pub_date, pk = force_str(
+            urlsafe_base64_decode(token)
+        ).split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (TypeError, ValueError):
+        raise Http404('Неверный курсор страницы.')
+    if direction not in (NEXT, PREVIOUS) or pub_date is None:
+        raise Http404('Неверный курсор страницы.')
+    return direction, pub_date, pk
+
+
+class CursorPage:
+    """Страница курсорной пагинации."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Пагинатор по ключу (pub_date, id) от новых к старым.
+
+    В отличие от Paginator не выполняет COUNT(*) и не использует OFFSET,
+    поэтому время выборки не зависит от номера страницы.
+    """
+
+    key_field = 'pub_date'
+    descending = True
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def _ordering(self, forward):
+        sign = '-' if self.descending == forward else ''
+        return f'{sign}{self.key_field}', f'{sign}pk'
+
+    def _beyond(self, key, pk, forward):
+        """Условие на объекты после позиции (key, pk) в направлении."""
+        lookup = 'lt' if self.descending == forward else 'gt'
+        return (
+            Q(**{f'{self.key_field}__{lookup}': key})
+            | Q(**{self.key_field: key, f'pk__{lookup}': pk})
+        )
+
+    def _cursor(self, direction, obj):
+        return encode_cursor(direction, obj, self.key_field)
+
+    def page(self, cursor=None):
+        """Возвращает страницу, следующую за позицией курсора."""
+        queryset = self.object_list.order_by(*self._ordering(True))
+        if not cursor:
+            items = list(queryset[:self.per_page + 1])
+            return self._build_page(items, has_before=False)
+        direction, key, pk = decode_cursor(cursor)
+        if direction == NEXT:
+            items = list(queryset.filter(
+                self._beyond(key, pk, True)
+            )[:self.per_page + 1])
+            return self._build_page(items, has_before=True)
+        items = list(queryset.filter(
+            self._beyond(key, pk, False)
+        ).order_by(*self._ordering(False))[:self.per_page + 1])
+        has_before = len(items) > self.per_page
+        items = items[:self.per_page][::-1]
+        return CursorPage(
+            items,
+            self,
+            self._cursor(NEXT, items[-1]) if items else None,
+            self._cursor(PREVIOUS, items[0]) if has_before else None,
+        )
+
+    def _build_page(self, items, has_before):
+        has_after = len(items) > self.per_page
+        items = items[:self.per_page]
+        return CursorPage(
+            items,
+            self,
+            self._cursor(NEXT, items[-1]) if has_after else None,
+            self._cursor(PREVIOUS, items[0]) if has_before and items
+            else None,
+        )
+
+
+class CommentCursorPaginator(CursorPaginator):
+    """Пагинатор комментариев по ключу (created_at, id) от старых к новым."""
+
+    key_field = 'created_at'
+    descending = False
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator, который не считает строки большой таблицы целиком.
+
+    Для выборки без условий при оценке больше ESTIMATED_COUNT_THRESHOLD
+    число строк берётся из estimate_count. Оценка бывает завышена,
+    например после массового удаления, поэтому номера страниц в конце
+    списка могут вести за пределы данных. Неполная страница уточняет
+    число строк без запроса, а пустая — точным COUNT(*), после чего
+    вместо неё отдаётся последняя страница.
+    """
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            estimate = estimate_count(self.object_list)
+            if estimate > ESTIMATED_COUNT_THRESHOLD:
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def _set_count(self, count):
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+        self.estimated = False
+
+    def page(self, number):
+        page = super().page(number)
+        if not self.estimated:
+            return page
+        size = len(page.object_list)
+        if size:
+            if size < self.per_page:
+                self._set_count((page.number - 1) * self.per_page + size)
+            return page
+        self._set_count(super().count)
+        return super().page(min(page.number, self.num_pages))
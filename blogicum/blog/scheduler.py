@@ -0,0 +1,47 @@
+"""
+Отложенные публикации.
+
+Лента выбирает посты по материализованному признаку Post.is_visible.
+Когда наступает pub_date, признак включается тиком планировщика:
+командой publish_scheduled или задачей publish_scheduled_posts, которую
+очередь запускает ровно ко времени ближайшей публикации.
+"""
+from django.db.models import Min
+from django.utils import timezone
+
+from . import feed
+from .cache import invalidate_posts
+from .models import Post
+
+
+def next_publication():
+    """Время ближайшей отложенной публикации или None."""
+    return Post.objects.filter(
+        is_published=True,
+        is_visible=False,
+        category__is_published=True,
+        pub_date__gt=timezone.now(),
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+
+
+def publish_due_posts():
+    """Показывает посты, время публикации которых наступило."""
+    post_ids = Post.objects.filter(
+        is_published=True,
+        is_visible=False,
+        category__is_published=True,
+        pub_date__lte=timezone.now(),
+    ).refresh_visibility()
+    if post_ids:
+        feed.sync_posts(post_ids)
+        invalidate_posts(post_ids)
+    return post_ids
+
+
+def schedule_next_publication():
+    """Ставит тик планировщика в очередь на время ближайшей публикации."""
+    from .tasks import publish_scheduled_posts
+
+    run_after = next_publication()
+    if run_after is not None:
+        publish_scheduled_posts.delay(unique=True, run_after=run_after)
@@ -0,0 +1,165 @@
+"""
+Полнотекстовый поиск по постам.
+
+На SQLite со сборкой FTS5 используется виртуальная таблица blog_post_fts,
+на остальных базах — инвертированный индекс в модели PostSearchToken.
+Индекс обновляется сигналами модели Post, а после правки комментариев
+переиндексация поста ставится в очередь задач.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Sum
+from django.db.models.expressions import RawSQL
+
+from .constants import (
+    SEARCH_COMMENT_WEIGHT, SEARCH_TEXT_WEIGHT, SEARCH_TITLE_WEIGHT
+)
+from .models import Comment, Post, PostSearchToken
+
+FTS_TABLE = 'blog_post_fts'
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Разбивает текст на слова в нижнем регистре."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def search_comments():
+    return getattr(settings, 'BLOG_SEARCH_COMMENTS', True)
+
+
+@lru_cache(maxsize=None)
+def _has_fts_table(database_name):
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+def fts_available():
+    """Проверяет, что база поддерживает FTS5 и таблица индекса создана."""
+    if connection.vendor != 'sqlite':
+        return False
+    return _has_fts_table(str(connection.settings_dict['NAME']))
+
+
+def _comments_text(post_id):
+    if not search_comments():
+        return ''
+    return '\n'.join(
+        Comment.objects.published().filter(
+            post_id=post_id
+        ).values_list('text', flat=True)
+    )
+
+
+class FTSBackend:
+    """Индекс на виртуальной таблице SQLite FTS5."""
+
+    def index_post(self, post):
+        comments = _comments_text(post.pk)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text, comments) '
+                'VALUES (%s, %s, %s, %s)',
+                [post.pk, post.title, post.text, comments],
+            )
+
+    def remove_post(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+    def search(self, queryset, tokens):
+        match = ' '.join(f'"{token}"' for token in tokens)
+        bm25 = (
+            f'bm25({FTS_TABLE}, {SEARCH_TITLE_WEIGHT}, '
+            f'{SEARCH_TEXT_WEIGHT}, {SEARCH_COMMENT_WEIGHT})'
+        )
+        return queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                [match],
+            )
+        ).annotate(
+            rank=RawSQL(
+                f'SELECT {bm25} FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s '
+                f'AND rowid = "{Post._meta.db_table}"."id"',
+                [match],
+            )
+        ).order_by('rank', '-pub_date')
+
+
+class TokenBackend:
+    """Инвертированный индекс в обычной таблице базы данных."""
+
+    def index_post(self, post):
+        weights = Counter()
+        for token in tokenize(post.title):
+            weights[token] += SEARCH_TITLE_WEIGHT
+        for token in tokenize(post.text):
+            weights[token] += SEARCH_TEXT_WEIGHT
+        for token in tokenize(_comments_text(post.pk)):
+            weights[token] += SEARCH_COMMENT_WEIGHT
+        self.remove_post(post.pk)
+        PostSearchToken.objects.bulk_create(
+            PostSearchToken(post_id=post.pk, token=token, weight=weight)
+            for token, weight in weights.items()
+        )
+
+    def remove_post(self, post_id):
+        PostSearchToken.objects.filter(post_id=post_id).delete()
+
+    def clear(self):
+        PostSearchToken.objects.all().delete()
+
+    def search(self, queryset, tokens):
+        return queryset.filter(
+            search_tokens__token__in=tokens
+        ).annotate(
+            rank=Sum('search_tokens__weight'),
+            matched=Count('search_tokens__token', distinct=True),
+        ).filter(matched=len(tokens)).order_by('-rank', '-pub_date')
+
+
+def get_backend():
+    """Выбирает FTS5, если он доступен, иначе индекс на таблице."""
+    return FTSBackend() if fts_available() else TokenBackend()
+
+
+def index_post(post):
+    get_backend().index_post(post)
+
+
+def remove_post(post_id):
+    get_backend().remove_post(post_id)
+
+
+def rebuild_index():
+    """Перестраивает индекс по всем постам. Возвращает их количество."""
+    backend = get_backend()
+    backend.clear()
+    total = 0
+    for post in Post.objects.only('pk', 'title', 'text').iterator():
+        backend.index_post(post)
+        total += 1
+    return total
+
+
+def search_posts(query):
+    """Возвращает опубликованные посты по запросу, лучшие — первыми."""
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return Post.published.none()
+    return get_backend().search(Post.published.all(), tokens)
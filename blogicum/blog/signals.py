@@ -0,0 +1,308 @@
+"""Обработчики сигналов моделей блога."""
+from contextlib import contextmanager
+from threading import local
+
+from django.conf import settings
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from . import feed, invalidation, scheduler, search
+from .cache import bump_versions, category_version, invalidate_posts
+from .models import Category, Comment, FeedEntry, Location, Post
+from .tasks import process_post_image, reindex_post
+
+_deleted_posts = local()
+_refreshed_posts = local()
+
+
+def _is_post_deleted(post_id):
+    """
+    Проверяет, что обработчики комментариев поста можно пропустить.
+
+    Так бывает, когда пост удаляется вместе со своими комментариями или
+    его комментарии меняются массово внутри refreshing_posts.
+    """
+    return (
+        post_id in getattr(_deleted_posts, 'ids', ())
+        or post_id in getattr(_refreshed_posts, 'ids', ())
+    )
+
+
+@contextmanager
+def refreshing_posts(post_ids):
+    """
+    Отключает обработчики комментариев постов post_ids в этом потоке.
+
+    Производные данные постов вызывающий код пересчитывает сам одним
+    проходом после массового изменения.
+    """
+    previous = getattr(_refreshed_posts, 'ids', set())
+    _refreshed_posts.ids = previous | set(post_ids)
+    try:
+        yield
+    finally:
+        _refreshed_posts.ids = previous
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    """Запоминает удаляемый пост до удаления его комментариев."""
+    if not hasattr(_deleted_posts, 'ids'):
+        _deleted_posts.ids = set()
+    _deleted_posts.ids.add(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    """Забывает пост после завершения удаления."""
+    _deleted_posts.ids.discard(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+def update_post_visibility(sender, instance, raw=False, **kwargs):
+    """Вычисляет признак видимости поста в ленте."""
+    if not raw:
+        instance.is_visible = instance.compute_visibility()
+
+
+@receiver(post_save, sender=Post)
+def schedule_post_publication(sender, instance, raw=False, **kwargs):
+    """Планирует показ отложенной публикации."""
+    if not raw and instance.is_published and not instance.is_visible:
+        scheduler.schedule_next_publication()
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+def remember_tracked_fields(sender, instance, raw=False, **kwargs):
+    """Запоминает поля категории или локации, от которых зависят посты."""
+    if not raw and instance.pk is not None:
+        invalidation.remember_state(instance)
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_page(sender, instance, **kwargs):
+    """Сбрасывает страницу категории: на ней выводится описание."""
+    bump_versions([category_version(instance.slug)])
+
+
+@receiver(post_save, sender=Category)
+def cascade_category_change(sender, instance, created, raw=False, **kwargs):
+    """Переносит изменения категории в её посты, ленту и кеш."""
+    fields = invalidation.changed_fields(instance)
+    if fields and not (created or raw):
+        invalidation.categories_changed([instance.pk], fields)
+
+
+@receiver(post_save, sender=Location)
+def cascade_location_change(sender, instance, created, raw=False, **kwargs):
+    """Переносит изменения локации в ленту и кеш."""
+    fields = invalidation.changed_fields(instance)
+    if fields and not (created or raw):
+        invalidation.locations_changed([instance.pk], fields)
+
+
+@receiver(post_delete, sender=Category)
+def hide_posts_without_category(sender, instance, **kwargs):
+    """Скрывает посты, оставшиеся без категории."""
+    feed.sync_posts(
+        Post.objects.filter(
+            category__isnull=True, is_visible=True
+        ).refresh_visibility()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, raw=False, **kwargs):
+    """
+    Увеличивает счётчик комментариев поста при создании комментария.
+
+    После правки комментарий мог быть скрыт или снова опубликован,
+    поэтому счётчик поста пересчитывается.
+    """
+    if raw:
+        return
+    posts = Post.objects.filter(pk=instance.post_id)
+    if not created:
+        posts.recount_comments()
+    elif instance.is_published:
+        posts.shift_comment_count(1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев поста при удалении комментария."""
+    if _is_post_deleted(instance.post_id) or not instance.is_published:
+        return
+    Post.objects.filter(pk=instance.post_id).shift_comment_count(-1)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_category(sender, instance, raw=False, **kwargs):
+    """Запоминает прежнюю категорию поста, чтобы сбросить её страницу."""
+    if not raw and instance.pk is not None:
+        instance._previous_category_id = Post.objects.filter(
+            pk=instance.pk
+        ).values_list('category_id', flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_card(sender, instance, **kwargs):
+    """Сбрасывает карточку изменённого поста и списки с ним."""
+    invalidate_posts([instance.pk], [
+        instance.category_id,
+        getattr(instance, '_previous_category_id', None),
+    ])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_commented_post_card(sender, instance, raw=False, **kwargs):
+    """Сбрасывает карточку поста, у которого изменились комментарии."""
+    if raw or _is_post_deleted(instance.post_id):
+        return
+    invalidate_posts([instance.post_id])
+
+
+@receiver(pre_delete, sender=Category)
+def invalidate_category_post_cards(sender, instance, **kwargs):
+    """Сбрасывает карточки постов и страницу категории."""
+    post_ids = Post.objects.filter(
+        category_id=instance.pk
+    ).values_list('pk', flat=True)
+    invalidate_posts(post_ids, [instance.pk])
+
+
+@receiver(pre_delete, sender=Location)
+def invalidate_location_post_cards(sender, instance, **kwargs):
+    """Сбрасывает карточки постов локации."""
+    post_ids = Post.objects.filter(
+        location_id=instance.pk
+    ).values_list('pk', flat=True)
+    invalidate_posts(post_ids)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_author_post_cards(sender, instance, update_fields=None,
+                                 **kwargs):
+    """Сбрасывает карточки постов автора после правки профиля."""
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    post_ids = Post.objects.filter(
+        author_id=instance.pk
+    ).values_list('pk', flat=True)
+    invalidate_posts(post_ids)
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, raw=False, **kwargs):
+    """Обновляет поисковый индекс поста."""
+    if not raw:
+        search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_deleted_post(sender, instance, **kwargs):
+    """Удаляет пост из поискового индекса."""
+    search.remove_post(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def index_commented_post(sender, instance, raw=False, **kwargs):
+    """
+    Ставит переиндексацию поста в очередь после правки комментария.
+
+    Пока задача не начата, новые комментарии к посту к ней присоединяются,
+    так что поток комментариев переиндексирует пост один раз.
+    """
+    if (raw or not search.search_comments()
+            or _is_post_deleted(instance.post_id)):
+        return
+    reindex_post.delay(unique=True, post_id=instance.post_id)
+
+
+@receiver(post_save, sender=Post)
+def enqueue_image_processing(sender, instance, raw=False, **kwargs):
+    """Ставит обработку изображения поста в очередь задач."""
+    if raw or not instance.image:
+        return
+    process_post_image.delay(unique=True, post_id=instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def sync_post_feed_entry(sender, instance, raw=False, **kwargs):
+    """Пересобирает строку ленты сохранённого поста."""
+    if not raw:
+        feed.sync_posts([instance.pk])
+
+
+@receiver(pre_delete, sender=Location)
+def clear_location_feed_entries(sender, instance, **kwargs):
+    """Убирает удаляемую локацию из ленты."""
+    feed.clear_location(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def rename_author_feed_entries(sender, instance, raw=False,
+                               update_fields=None, **kwargs):
+    """Переносит имя пользователя автора в ленту."""
+    if raw or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    feed.rename_author(instance)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def copy_feed_comment_count(sender, instance, raw=False, **kwargs):
+    """Переносит счётчик комментариев поста в ленту."""
+    if raw or _is_post_deleted(instance.post_id):
+        return
+    feed.copy_comment_counts(FeedEntry.objects.filter(pk=instance.post_id))
+
+
+def _refresh_loaded_posts(posts):
+    """Пересчитывает видимость и ленту постов после loaddata."""
+    posts.refresh_visibility()
+    feed.sync_posts(list(posts.values_list('pk', flat=True)))
+    scheduler.schedule_next_publication()
+
+
+@receiver(post_save, sender=Post)
+def refresh_loaded_post(sender, instance, raw=False, **kwargs):
+    """Пересчитывает видимость, ленту и индекс поста из фикстуры."""
+    if raw:
+        _refresh_loaded_posts(Post.objects.filter(pk=instance.pk))
+        search.index_post(instance)
+
+
+@receiver(post_save, sender=Category)
+def refresh_loaded_category_posts(sender, instance, raw=False, **kwargs):
+    """Пересчитывает посты категории, загруженной после них."""
+    if raw:
+        _refresh_loaded_posts(Post.objects.filter(category_id=instance.pk))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_loaded_author_posts(sender, instance, raw=False, **kwargs):
+    """Добавляет в ленту посты автора, загруженного после них."""
+    if raw:
+        feed.sync_posts(list(
+            Post.objects.filter(
+                author_id=instance.pk, is_visible=True
+            ).values_list('pk', flat=True)
+        ))
+
+
+@receiver(post_save, sender=Comment)
+def recount_loaded_comment(sender, instance, raw=False, **kwargs):
+    """Пересчитывает комментарии поста после загрузки комментария."""
+    if raw:
+        Post.objects.filter(pk=instance.post_id).recount_comments()
+        feed.copy_comment_counts(
+            FeedEntry.objects.filter(pk=instance.post_id)
+        )
+        invalidate_posts([instance.post_id])
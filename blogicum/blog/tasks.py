@@ -0,0 +1,44 @@
+"""Фоновые задачи блога."""
+from tasks.registry import task
+
+from . import search
+from .cache import invalidate_posts
+from .images import create_variants, strip_exif
+from .models import FeedEntry, Post
+from .scheduler import publish_due_posts, schedule_next_publication
+
+
+@task
+def process_post_image(post_id):
+    """Очищает EXIF изображения поста и готовит его уменьшенные копии."""
+    post = Post.objects.filter(pk=post_id).only('pk', 'image').first()
+    if post is None or not post.image:
+        return
+    if not post.image.storage.exists(post.image.name):
+        return
+    strip_exif(post.image)
+    variants = create_variants(post.image)
+    Post.objects.filter(pk=post.pk, image=post.image.name).update(
+        image_variants=variants
+    )
+    FeedEntry.objects.filter(pk=post.pk, image=post.image.name).update(
+        image_variants=variants
+    )
+    invalidate_posts([post.pk])
+
+
+@task
+def reindex_post(post_id):
+    """Переиндексирует пост вместе с текстом его комментариев."""
+    post = Post.objects.filter(pk=post_id).only(
+        'pk', 'title', 'text'
+    ).first()
+    if post is not None:
+        search.index_post(post)
+
+
+@task
+def publish_scheduled_posts():
+    """Тик планировщика: показывает наступившие публикации."""
+    publish_due_posts()
+    schedule_next_publication()
@@ -0,0 +1,53 @@
+from django import template
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog.cache import post_card_cache_key
+from blog.constants import (
+    IMAGE_PROCESSING_KEY, IMAGE_PROCESSING_TIMEOUT, POST_CARD_CACHE_TIMEOUT
+)
+from blog.images import get_variants
+from blog.tasks import process_post_image
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    """Отрисовывает карточку поста, используя кеш фрагментов."""
+    key = post_card_cache_key(post.pk)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string('includes/post_card.html', {'post': post})
+        cache.set(key, html, POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+@register.simple_tag(takes_context=True)
+def query_replace(context, **kwargs):
+    """Возвращает параметры текущего запроса с заменёнными значениями."""
+    query = context['request'].GET.copy()
+    for key, value in kwargs.items():
+        query[key] = value
+    return query.urlencode()
+
+
+@register.simple_tag
+def image_srcset(field_file):
+    """
+    Возвращает значение srcset из уменьшенных копий изображения.
+
+    Если копий ещё нет, ставит их создание в очередь задач не чаще
+    раза в IMAGE_PROCESSING_TIMEOUT секунд.
+    """
+    variants = get_variants(field_file, field_file.instance.image_variants)
+    if field_file and not variants and cache.add(
+        IMAGE_PROCESSING_KEY.format(name=field_file.name),
+        True,
+        IMAGE_PROCESSING_TIMEOUT,
+    ) and field_file.storage.exists(field_file.name):
+        process_post_image.delay(
+            unique=True, post_id=field_file.instance.pk
+        )
+    return ', '.join(f'{url} {width}w' for url, width in variants)
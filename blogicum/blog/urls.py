@@ -1,17 +1,18 @@
 from django.urls import path
 
 from . import views
+from .async_views import as_configured_view
 
 app_name = 'blog'
 
 urlpatterns = [
 
-    path('', views.PostListView.as_view(),
+    path('', as_configured_view(views.PostListView),
          name='index'
          ),
 
     path('<int:pk>/',
-         views.PostDetailView.as_view(),
+         as_configured_view(views.PostDetailView),
          name='post_detail'
          ),
 
@@ -30,6 +31,11 @@ urlpatterns = [
          name='delete_post'
          ),
 
+    path('<int:pk>/comments/',
+         as_configured_view(views.CommentListView),
+         name='comments'
+         ),
+
     path('<int:pk>/comment/',
          views.CommentCreateView.as_view(),
          name='add_comment'
@@ -45,8 +51,18 @@ urlpatterns = [
          name='delete_comment'
          ),
 
+    path('export/<slug:dataset>/',
+         views.ExportView.as_view(),
+         name='export'
+         ),
+
+    path('search/',
+         views.PostSearchView.as_view(),
+         name='search'
+         ),
+
     path('category/<slug:category_slug>/',
-         views.PostListView.as_view(),
+         as_configured_view(views.PostListView),
          name='category_posts'
          )
 ]
@@ -1,72 +1,133 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import Http404
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
-from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views.generic import (
-    ListView, DetailView, CreateView, UpdateView, DeleteView
+    ListView, DetailView, CreateView, UpdateView, DeleteView, View
 )
 
-from .mixins import OnlyAuthorMixin
+from .cache import category_version, feed_cache_timeout, post_version
+from .mixins import (
+    AnonymousPageCacheMixin, CursorPaginationMixin, OnlyAuthorMixin
+)
 from .forms import CommentForm, PostForm
-from .constants import POSTS_PER_PAGE
-from .models import Category, Comment, Post
+from .constants import (
+    COMMENTS_PER_PAGE, CURSOR_QUERY_PARAM, POSTS_PER_PAGE, SEARCH_QUERY_PARAM
+)
+from .models import Category, Comment, FeedEntry, Post
+from .export import DATASETS, rows, to_ndjson
+from .paginators import CommentCursorPaginator
+from .search import search_posts
 
 
-class PostListView(ListView):
+class PostListView(AnonymousPageCacheMixin, CursorPaginationMixin, ListView):
     """Представление списка постов."""
 
     model = Post
     template_name = 'blog/index.html'
     paginate_by = POSTS_PER_PAGE
 
+    def get_page_cache_timeout(self):
+        """Страница ленты живёт до выхода ближайшей отложенной публикации."""
+        return feed_cache_timeout()
+
+    def get_page_cache_versions(self):
+        """Страница категории сбрасывается только с постами категории."""
+        category_slug = self.kwargs.get('category_slug')
+        if category_slug:
+            return (category_version(category_slug),)
+        return super().get_page_cache_versions()
+
     def get_queryset(self):
         """
         Возвращает опубликованные посты принадлежащие выбранной категории.
 
         Или все опубликованные посты если категория не выбрана.
         Возвращает 404 если категория снята с публикации.
+        При BLOG_FEED_READ_MODEL читает денормализованную ленту FeedEntry.
         """
+        use_feed = getattr(settings, 'BLOG_FEED_READ_MODEL', False)
         category_slug = self.kwargs.get('category_slug')
         if category_slug:
             category = Category.objects.filter(
                 slug=category_slug,
                 is_published=True,
             ).first()
-            if category:
-                return category.posts(manager='published').all()
-            else:
+            if not category:
                 raise Http404
+            if use_feed:
+                return FeedEntry.objects.filter(category_slug=category.slug)
+            return category.posts(manager='published').all()
+        if use_feed:
+            return FeedEntry.objects.all()
         return Post.published.all()
 
 
-class PostDetailView(DetailView):
+class PostSearchView(ListView):
+    """Поиск по опубликованным постам."""
+
+    template_name = 'blog/search.html'
+    paginate_by = POSTS_PER_PAGE
+
+    def get_search_query(self):
+        return self.request.GET.get(SEARCH_QUERY_PARAM, '').strip()
+
+    def get_queryset(self):
+        """Возвращает найденные посты, наиболее подходящие — первыми."""
+        return search_posts(self.get_search_query())
+
+    def get_context_data(self, **kwargs):
+        """Добавляет в контекст строку поиска."""
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.get_search_query()
+        return context
+
+
+class PostDetailView(AnonymousPageCacheMixin, DetailView):
     """Детальное представление поста."""
 
     model = Post
     template_name = 'blog/detail.html'
 
-    def get(self, request, *args, **kwargs):
-        """Возвращает опубликованные посты. Или все посты автора."""
-        self.object = self.get_object()
-        if (all
-            ([self.object.is_published, self.object.pub_date <= timezone.now(),
-             self.object.category.is_published])
-                or (self.object.author == self.request.user)):
-            return super().get(request, *args, **kwargs)
-        else:
-            raise Http404
+    def get_page_cache_versions(self):
+        return (post_version(self.kwargs['pk']),)
+
+    def get_queryset(self):
+        """Загружает пост со связанными объектами."""
+        return Post.objects.with_related_data()
+
+    def get_object(self, queryset=None):
+        """Возвращает опубликованный пост. Или любой пост автора."""
+        post = super().get_object(queryset)
+        if post.is_visible or post.author == self.request.user:
+            return post
+        raise Http404
+
+    def get_comments_page(self):
+        """Страница комментариев, следующая за курсором из запроса."""
+        paginator = CommentCursorPaginator(
+            self.object.comments.published().select_related('author'),
+            COMMENTS_PER_PAGE,
+        )
+        return paginator.page(self.request.GET.get(CURSOR_QUERY_PARAM))
 
     def get_context_data(self, **kwargs):
-        """Добавляет в контекст форму для комментариев и сами комментарии."""
+        """Добавляет в контекст форму и первую страницу комментариев."""
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments.select_related('author')
-        ).order_by('created_at')
+        context['comments'] = self.get_comments_page()
         return context
 
 
+class CommentListView(PostDetailView):
+    """Следующая страница комментариев поста HTML-фрагментом."""
+
+    template_name = 'includes/comment_list.html'
+
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     """Представление для создания поста."""
 
@@ -115,8 +176,7 @@ class PostDeleteView(OnlyAuthorMixin, DeleteView):
 
     def get(self, request, *args, **kwargs):
         """Вызывает 404 при переходе на страницу не опубликованного поста."""
-        self.object = self.get_object()
-        if not self.object.is_published:
+        if not self.get_object().is_published:
             raise Http404
         return super().get(request, *args, **kwargs)
 
@@ -151,11 +211,11 @@ class CommentUpdateView(OnlyAuthorMixin, UpdateView):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
+    pk_url_kwarg = 'comment_id'
 
-    def get_object(self):
-        """Возвращает объект комментария или 404 если такого нет."""
-        comment = get_object_or_404(Comment, pk=self.kwargs['comment_id'])
-        return comment
+    def get_queryset(self):
+        """Ищет комментарий только среди комментариев поста из URL."""
+        return Comment.objects.filter(post_id=self.kwargs['post_id'])
 
     def get_success_url(self, *args, **kwargs):
         """Редирект при успешном редактировании."""
@@ -169,11 +229,11 @@ class CommentDeleteView(OnlyAuthorMixin, DeleteView):
 
     model = Comment
     template_name = 'blog/comment.html'
+    pk_url_kwarg = 'comment_id'
 
-    def get_object(self):
-        """Возвращает объект комментария или 404 если такого нет."""
-        comment = get_object_or_404(Comment, pk=self.kwargs['comment_id'])
-        return comment
+    def get_queryset(self):
+        """Ищет комментарий только среди комментариев поста из URL."""
+        return Comment.objects.filter(post_id=self.kwargs['post_id'])
 
     def get_success_url(self, *args, **kwargs):
         """Редирект при успешном редактировании."""
@@ -186,3 +246,25 @@ class CommentDeleteView(OnlyAuthorMixin, DeleteView):
         context = super().get_context_data(**kwargs)
         context['form'] = None
         return context
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ExportView(View):
+    """
+    Потоковая выгрузка опубликованного набора данных в NDJSON.
+
+    Чтобы продолжить оборванную выгрузку, передайте в параметре after
+    id последней полученной строки.
+    """
+
+    def get(self, request, dataset):
+        if dataset not in DATASETS:
+            raise Http404
+        try:
+            after = int(request.GET.get('after', 0))
+        except ValueError:
+            return HttpResponseBadRequest('Параметр after должен быть числом.')
+        return StreamingHttpResponse(
+            map(to_ndjson, rows(dataset, after)),
+            content_type='application/x-ndjson; charset=utf-8',
+        )
@@ -11,6 +11,7 @@ handler500 = 'pages.views.internal_server'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', include('metrics.urls', namespace='metrics')),
     path('posts/', include('blog.urls', namespace='blog')),
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
@@ -23,7 +24,7 @@ urlpatterns = [
     path('profile/', include('users.urls')),
 ]
 
-if settings.DEBUG:
+if settings.DEBUG_TOOLBAR:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
 
@@ -0,0 +1,10 @@
+# {имя URL: {'user' или 'ip': (запросов, за секунд)}}
+RATE_LIMITS = {
+    'blog:add_comment': {'user': (5, 60), 'ip': (20, 60)},
+    'blog:create_post': {'user': (5, 60 * 5), 'ip': (10, 60 * 5)},
+    'registration': {'ip': (5, 60 * 60)},
+    'login': {'ip': (10, 60 * 5)},
+}
+RATE_LIMIT_METHODS = ('POST',)
+RATE_LIMIT_CACHE = 'default'
+RATE_LIMIT_KEY = 'ratelimit:{url_name}:{scope}:{ident}'
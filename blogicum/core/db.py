@@ -0,0 +1,79 @@
+"""
+Настройка SQLite и разделение чтения и записи.
+
+При открытии соединения включаются WAL и прагмы из SQLITE_PRAGMAS:
+в режиме WAL читатели не ждут писателя. Запись идёт через соединение
+default, чтение — через соединение DATABASE_READ_ALIAS к тому же файлу,
+открытое только для чтения. Внутри транзакции чтение тоже идёт через
+default, иначе не были бы видны её собственные незафиксированные
+изменения.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Max
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+
+def get_read_alias():
+    alias = getattr(settings, 'DATABASE_READ_ALIAS', None)
+    return alias if alias in settings.DATABASES else DEFAULT_DB_ALIAS
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Применяет прагмы к только что открытому соединению SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', SQLITE_PRAGMAS)
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        if connection.alias == get_read_alias() != DEFAULT_DB_ALIAS:
+            cursor.execute('PRAGMA query_only = ON')
+
+
+def estimate_count(queryset):
+    """
+    Приблизительное число строк таблицы модели queryset без COUNT(*).
+
+    На PostgreSQL берётся из статистики планировщика, на остальных базах —
+    наибольший первичный ключ: удалённые строки дают оценку сверху.
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else 0
+    return model._base_manager.using(queryset.db).aggregate(
+        estimate=Max('pk')
+    )['estimate'] or 0
+
+
+class ReadWriteRouter:
+    """Направляет чтение в DATABASE_READ_ALIAS, запись — в default."""
+
+    def db_for_read(self, model, **hints):
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Оба соединения открывают один и тот же файл.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
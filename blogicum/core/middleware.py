@@ -0,0 +1,21 @@
+import math
+from http import HTTPStatus
+
+from django.shortcuts import render
+from django.utils.deprecation import MiddlewareMixin
+
+from .ratelimit import check
+
+
+class RateLimitMiddleware(MiddlewareMixin):
+    """Отвечает 429, если запрос превышает лимит для имени своего URL."""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        wait = check(request, request.resolver_match.view_name)
+        if not wait:
+            return None
+        response = render(
+            request, 'pages/429.html', status=HTTPStatus.TOO_MANY_REQUESTS
+        )
+        response['Retry-After'] = math.ceil(wait)
+        return response
@@ -0,0 +1,86 @@
+"""
+Ограничение частоты запросов корзинами токенов в кеше.
+
+На каждое имя URL из RATE_LIMITS заводятся корзины на пользователя
+и на IP-адрес. Корзина вмещает limit токенов и пополняется равномерно
+за period секунд; запрос забирает по токену из всех своих корзин и
+отклоняется, если хотя бы одна пуста. Состояние корзины хранится
+в кеше RATE_LIMIT_CACHE, поэтому при нескольких процессах нужен общий
+кеш, например файловый. Чтение и запись корзины не атомарны: при
+одновременных запросах лимит может быть превышен на несколько
+запросов, что для защиты от ботов допустимо.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .constants import (
+    RATE_LIMIT_CACHE, RATE_LIMIT_KEY, RATE_LIMIT_METHODS, RATE_LIMITS
+)
+
+
+def get_limits(url_name):
+    """Лимиты {'user' или 'ip': (запросов, за секунд)} для имени URL."""
+    return getattr(settings, 'RATE_LIMITS', RATE_LIMITS).get(url_name, {})
+
+
+def _cache():
+    return caches[getattr(settings, 'RATE_LIMIT_CACHE', RATE_LIMIT_CACHE)]
+
+
+def take_tokens(buckets, now=None):
+    """
+    Забирает по токену из каждой корзины (key, limit, period).
+
+    Токены забираются, только если их хватает во всех корзинах, чтобы
+    отклонённый запрос не расходовал остальные корзины. Возвращает 0,
+    если токены забраны, иначе — сколько секунд ждать следующего.
+    """
+    cache = _cache()
+    now = time.time() if now is None else now
+    wait, refilled = 0, []
+    for key, limit, period in buckets:
+        rate = limit / period
+        tokens, updated = cache.get(key, (limit, now))
+        tokens = min(limit, tokens + (now - updated) * rate)
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) / rate)
+        refilled.append((key, tokens, period))
+    if wait:
+        return wait
+    for key, tokens, period in refilled:
+        cache.set(key, (tokens - 1, now), math.ceil(period))
+    return 0
+
+
+def take_token(key, limit, period, now=None):
+    """Забирает токен из одной корзины key, см. take_tokens."""
+    return take_tokens([(key, limit, period)], now=now)
+
+
+def _identities(request):
+    yield 'ip', request.META.get('REMOTE_ADDR', '')
+    if request.user.is_authenticated:
+        yield 'user', request.user.pk
+
+
+def check(request, url_name):
+    """
+    Проверяет лимиты запроса к url_name.
+
+    Возвращает 0 или время в секундах до следующей разрешённой попытки.
+    """
+    methods = getattr(settings, 'RATE_LIMIT_METHODS', RATE_LIMIT_METHODS)
+    if request.method not in methods:
+        return 0
+    limits = get_limits(url_name)
+    return take_tokens([
+        (
+            RATE_LIMIT_KEY.format(url_name=url_name, scope=scope, ident=ident),
+            *limits[scope],
+        )
+        for scope, ident in _identities(request)
+        if scope in limits
+    ])
@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import RequestSample
+
+
+@admin.register(RequestSample)
+class RequestSampleAdmin(admin.ModelAdmin):
+    """Отображение замеров запросов в админке."""
+
+    list_display = (
+        'url_name',
+        'status',
+        'duration',
+        'query_count',
+        'sql_time',
+        'template_time',
+        'response_size',
+        'created_at',
+    )
+    list_filter = ('url_name', 'status')
@@ -0,0 +1,8 @@
+URL_NAME_MAX_LEN = 256
+METRICS_NAMESPACES = ('blog', 'users', 'pages')
+METRICS_SAMPLE_RATE = 1.0
+METRICS_FLUSH_SIZE = 50
+METRICS_FLUSH_INTERVAL = 10
+METRICS_RETENTION_DAYS = 7
+METRICS_WINDOW_MINUTES = 60
+PERCENTILES = (50, 90, 99)
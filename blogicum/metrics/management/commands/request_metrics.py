@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from metrics.constants import (
+    METRICS_RETENTION_DAYS, METRICS_WINDOW_MINUTES, PERCENTILES
+)
+from metrics.models import RequestSample
+from metrics.stats import METRICS, summarize
+
+
+class Command(BaseCommand):
+    help = 'Выводит перцентили метрик запросов по именам URL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes',
+            type=int,
+            default=METRICS_WINDOW_MINUTES,
+            help='Окно замеров в минутах.',
+        )
+        parser.add_argument(
+            '--url-name',
+            help='Показать только это имя URL, например blog:index.',
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Удалить замеры старше METRICS_RETENTION_DAYS дней.',
+        )
+
+    def handle(self, *args, **options):
+        if options['prune']:
+            days = getattr(
+                settings, 'METRICS_RETENTION_DAYS', METRICS_RETENTION_DAYS
+            )
+            deleted, _ = RequestSample.objects.filter(
+                created_at__lt=timezone.now() - timedelta(days=days)
+            ).delete()
+            self.stdout.write(f'Удалено замеров: {deleted}')
+        summary = summarize(options['minutes'], options['url_name'])
+        if not summary:
+            self.stdout.write('Замеров нет.')
+            return
+        percentiles = '/'.join(f'p{p}' for p in PERCENTILES)
+        for url_name, stats in summary.items():
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f'{url_name} (запросов: {stats["count"]})'
+                )
+            )
+            for metric in METRICS:
+                values = '/'.join(
+                    '-' if value is None else f'{value:.1f}'
+                    for value in stats[metric].values()
+                )
+                self.stdout.write(f'  {metric} {percentiles}: {values}')
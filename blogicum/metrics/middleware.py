@@ -0,0 +1,176 @@
+"""Замеры запросов к представлениям."""
+import asyncio
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from . import recorder
+from .constants import METRICS_NAMESPACES, METRICS_SAMPLE_RATE
+
+_measurement = ContextVar('request_measurement', default=None)
+
+
+class QueryCounter:
+    """Обёртка execute_wrapper: число запросов и их суммарное время."""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.time += time.perf_counter() - start
+
+
+class Measurement:
+    """Замер текущего запроса."""
+
+    def __init__(self):
+        self.queries = QueryCounter()
+        self.template_time = 0.0
+
+
+@contextmanager
+def count_queries(counter):
+    """Считает counter запросы всех соединений текущего потока."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        yield
+
+
+def measured(func):
+    """
+    Считает запросы func в замер запроса, из которого она вызвана.
+
+    Нужен для синхронного кода, который асинхронное представление
+    выполняет в другом потоке через sync_to_async.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        measurement = _measurement.get()
+        if measurement is None:
+            return func(*args, **kwargs)
+        with count_queries(measurement.queries):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def render_measured(response):
+    """Отрисовывает TemplateResponse, учитывая время в замере запроса."""
+    start = time.perf_counter()
+    response.render()
+    measurement = _measurement.get()
+    if measurement is not None:
+        measurement.template_time += time.perf_counter() - start
+    return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Записывает для представлений из METRICS_NAMESPACES число и время
+    SQL-запросов, время отрисовки шаблона, время и размер ответа.
+
+    Не зависит от DEBUG: запросы считаются через execute_wrapper, доля
+    замеряемых запросов задаётся METRICS_SAMPLE_RATE. Для потоковых
+    ответов учитывается только время до начала передачи. Под ASGI
+    запросы считаются в коде, обёрнутом measured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так Django узнаёт асинхронный middleware, как и MiddlewareMixin.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+        measurement = Measurement()
+        token = _measurement.set(measurement)
+        start = time.perf_counter()
+        try:
+            with count_queries(measurement.queries):
+                response = self.get_response(request)
+        finally:
+            _measurement.reset(token)
+        if self.record(request, response, measurement, start):
+            recorder.flush()
+        return response
+
+    async def __acall__(self, request):
+        if not self.is_sampled():
+            return await self.get_response(request)
+        measurement = Measurement()
+        token = _measurement.set(measurement)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _measurement.reset(token)
+        if self.record(request, response, measurement, start):
+            await sync_to_async(recorder.flush)()
+        return response
+
+    def process_template_response(self, request, response):
+        """Замеряет отрисовку TemplateResponse вместе с её запросами."""
+        measurement = _measurement.get()
+        if measurement is None:
+            return response
+        start = time.perf_counter()
+
+        def finish(response):
+            measurement.template_time += time.perf_counter() - start
+
+        response.add_post_render_callback(finish)
+        return response
+
+    @staticmethod
+    def is_sampled():
+        sample_rate = getattr(
+            settings, 'METRICS_SAMPLE_RATE', METRICS_SAMPLE_RATE
+        )
+        return random.random() < sample_rate
+
+    def record(self, request, response, measurement, start):
+        """Добавляет замер. Возвращает True, если буфер пора записать."""
+        url_name = self.get_url_name(request)
+        if url_name is None:
+            return False
+        return recorder.record(
+            url_name=url_name,
+            status=response.status_code,
+            duration=(time.perf_counter() - start) * 1000,
+            query_count=measurement.queries.count,
+            sql_time=measurement.queries.time * 1000,
+            template_time=measurement.template_time * 1000,
+            response_size=(
+                None if response.streaming else len(response.content)
+            ),
+        )
+
+    @staticmethod
+    def get_url_name(request):
+        match = request.resolver_match
+        namespaces = getattr(
+            settings, 'METRICS_NAMESPACES', METRICS_NAMESPACES
+        )
+        if match is None or match.namespace not in namespaces:
+            return None
+        return match.view_name
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(max_length=256, verbose_name='Имя URL')),
+                ('status', models.PositiveSmallIntegerField(verbose_name='Код ответа')),
+                ('duration', models.FloatField(verbose_name='Время ответа, мс')),
+                ('query_count', models.PositiveIntegerField(verbose_name='Запросов к базе')),
+                ('sql_time', models.FloatField(verbose_name='Время SQL, мс')),
+                ('template_time', models.FloatField(verbose_name='Время отрисовки шаблона, мс')),
+                ('response_size', models.PositiveIntegerField(help_text='Не заполняется для потоковых ответов.', null=True, verbose_name='Размер ответа, байт')),
+                ('created_at', models.DateTimeField(verbose_name='Время замера')),
+            ],
+            options={
+                'verbose_name': 'замер запроса',
+                'verbose_name_plural': 'Замеры запросов',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='requestsample',
+            index=models.Index(fields=['created_at', 'url_name'], name='request_sample_window_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+"""Модели метрик запросов."""
+from django.db import models
+
+from .constants import URL_NAME_MAX_LEN
+
+
+class RequestSample(models.Model):
+    """Замер одного запроса к представлению."""
+
+    url_name = models.CharField(
+        max_length=URL_NAME_MAX_LEN,
+        verbose_name='Имя URL'
+    )
+    status = models.PositiveSmallIntegerField(
+        verbose_name='Код ответа'
+    )
+    duration = models.FloatField(
+        verbose_name='Время ответа, мс'
+    )
+    query_count = models.PositiveIntegerField(
+        verbose_name='Запросов к базе'
+    )
+    sql_time = models.FloatField(
+        verbose_name='Время SQL, мс'
+    )
+    template_time = models.FloatField(
+        verbose_name='Время отрисовки шаблона, мс'
+    )
+    response_size = models.PositiveIntegerField(
+        null=True,
+        verbose_name='Размер ответа, байт',
+        help_text='Не заполняется для потоковых ответов.'
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Время замера'
+    )
+
+    def __str__(self):
+        return f'{self.url_name} {self.duration:.1f} мс'
+
+    class Meta:
+        verbose_name = 'замер запроса'
+        verbose_name_plural = 'Замеры запросов'
+        ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('created_at', 'url_name'),
+                name='request_sample_window_idx',
+            ),
+        )
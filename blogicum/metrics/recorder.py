@@ -0,0 +1,58 @@
+"""
+Буфер замеров запросов.
+
+Замеры копятся в памяти процесса и записываются в базу одним INSERT
+по METRICS_FLUSH_SIZE штук или не реже раза в METRICS_FLUSH_INTERVAL
+секунд, чтобы запись метрик не добавляла запрос к каждому ответу.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .constants import METRICS_FLUSH_INTERVAL, METRICS_FLUSH_SIZE
+from .models import RequestSample
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_buffer = []
+_last_flush = time.monotonic()
+
+
+def record(**values):
+    """
+    Добавляет замер в буфер.
+
+    Возвращает True, если буфер пора записать вызовом flush.
+    """
+    global _last_flush
+    sample = RequestSample(created_at=timezone.now(), **values)
+    flush_size = getattr(settings, 'METRICS_FLUSH_SIZE', METRICS_FLUSH_SIZE)
+    flush_interval = getattr(
+        settings, 'METRICS_FLUSH_INTERVAL', METRICS_FLUSH_INTERVAL
+    )
+    with _lock:
+        _buffer.append(sample)
+        now = time.monotonic()
+        if (len(_buffer) < flush_size
+                and now - _last_flush < flush_interval):
+            return False
+        _last_flush = now
+    return True
+
+
+def flush():
+    """Записывает накопленные замеры. Ошибки базы не мешают ответу."""
+    with _lock:
+        samples = _buffer[:]
+        _buffer.clear()
+    if not samples:
+        return
+    try:
+        RequestSample.objects.bulk_create(samples)
+    except DatabaseError:
+        logger.exception('Не удалось записать замеры запросов')
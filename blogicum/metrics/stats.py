@@ -0,0 +1,49 @@
+"""Перцентили замеров запросов."""
+import math
+from datetime import timedelta
+from itertools import groupby
+
+from django.utils import timezone
+
+from .constants import PERCENTILES
+from .models import RequestSample
+
+METRICS = (
+    'duration',
+    'query_count',
+    'sql_time',
+    'template_time',
+    'response_size',
+)
+
+
+def percentile(values, p):
+    """Перцентиль p по методу ближайшего ранга для сортированного списка."""
+    if not values:
+        return None
+    rank = max(math.ceil(p / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def summarize(minutes, url_name=None):
+    """
+    Перцентили метрик по именам URL за последние minutes минут.
+
+    Возвращает словарь {имя URL: {'count': n, метрика: {'p50': ...}}}.
+    """
+    samples = RequestSample.objects.filter(
+        created_at__gte=timezone.now() - timedelta(minutes=minutes)
+    )
+    if url_name:
+        samples = samples.filter(url_name=url_name)
+    rows = samples.order_by('url_name').values_list('url_name', *METRICS)
+    summary = {}
+    for name, group in groupby(rows, key=lambda row: row[0]):
+        columns = list(zip(*group))[1:]
+        summary[name] = {'count': len(columns[0])}
+        for metric, values in zip(METRICS, columns):
+            values = sorted(value for value in values if value is not None)
+            summary[name][metric] = {
+                f'p{p}': percentile(values, p) for p in PERCENTILES
+            }
+    return summary
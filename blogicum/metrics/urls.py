@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'metrics'
+
+urlpatterns = [
+    path('', views.request_metrics, name='request_metrics'),
+]
@@ -0,0 +1,18 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from .constants import METRICS_WINDOW_MINUTES
+from .stats import summarize
+
+
+@staff_member_required
+def request_metrics(request):
+    """Перцентили метрик запросов для сотрудников в JSON."""
+    try:
+        minutes = int(request.GET.get('minutes', METRICS_WINDOW_MINUTES))
+    except ValueError:
+        minutes = METRICS_WINDOW_MINUTES
+    return JsonResponse(
+        summarize(minutes, request.GET.get('url_name')),
+        json_dumps_params={'ensure_ascii': False},
+    )
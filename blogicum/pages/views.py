@@ -3,13 +3,18 @@ from http import HTTPStatus
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from blog.cache import PAGES_VERSION
+from blog.mixins import AnonymousPageCacheMixin
 
-class AboutTemplateView(TemplateView):
+
+class AboutTemplateView(AnonymousPageCacheMixin, TemplateView):
     template_name = 'pages/about.html'
+    page_cache_versions = (PAGES_VERSION,)
 
 
-class RulesTemplateView(TemplateView):
+class RulesTemplateView(AnonymousPageCacheMixin, TemplateView):
     template_name = 'pages/rules.html'
+    page_cache_versions = (PAGES_VERSION,)
 
 
 def csrf_failure(request, reason=''):
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Отображение фоновых задач в админке."""
+
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+        'created_at',
+        'finished_at',
+    )
+    list_filter = ('status', 'name')
+    readonly_fields = (
+        'created_at', 'started_at', 'finished_at', 'last_error'
+    )
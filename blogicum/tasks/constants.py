@@ -0,0 +1,7 @@
+TASK_NAME_MAX_LEN = 256
+TASK_MAX_ATTEMPTS = 3
+TASK_RETRY_DELAY = 60
+WORKER_POLL_INTERVAL = 1
+# Задача в статусе «Выполняется» дольше этого срока считается брошенной
+# упавшим worker и возвращается в очередь.
+TASK_RUNNING_TIMEOUT = 60 * 30
@@ -0,0 +1,52 @@
+"""Отправка писем через очередь фоновых задач."""
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .registry import task
+
+
+def serialize_message(message):
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': list(message.to),
+        'cc': list(message.cc),
+        'bcc': list(message.bcc),
+        'reply_to': list(message.reply_to),
+        'headers': dict(message.extra_headers),
+        'alternatives': [
+            list(alternative)
+            for alternative in getattr(message, 'alternatives', ())
+        ],
+    }
+
+
+def deserialize_message(data, connection=None):
+    data = dict(data)
+    alternatives = [tuple(item) for item in data.pop('alternatives')]
+    return EmailMultiAlternatives(
+        alternatives=alternatives, connection=connection, **data
+    )
+
+
+@task
+def send_emails(messages):
+    """Отправляет письма бэкендом из настройки TASKS_EMAIL_BACKEND."""
+    connection = get_connection(settings.TASKS_EMAIL_BACKEND)
+    connection.send_messages(
+        [deserialize_message(data, connection) for data in messages]
+    )
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который ставит письма в очередь задач."""
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        send_emails.delay(
+            messages=[serialize_message(m) for m in email_messages]
+        )
+        return len(email_messages)
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.constants import WORKER_POLL_INTERVAL
+from tasks.registry import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Запускает worker очереди фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=WORKER_POLL_INTERVAL,
+            help='Пауза между опросами пустой очереди, в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            done = run_pending()
+            self.stdout.write(self.style.SUCCESS(f'Выполнено задач: {done}'))
+            return
+        self.stdout.write('Worker запущен, Ctrl+C для остановки.')
+        try:
+            while True:
+                if not run_pending():
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write('Worker остановлен.')
@@ -0,0 +1,87 @@
+"""Модели очереди фоновых задач."""
+from django.db import models
+from django.utils import timezone
+
+from .constants import TASK_MAX_ATTEMPTS, TASK_NAME_MAX_LEN
+
+
+class TaskQuerySet(models.QuerySet):
+    """Расширяет стандартный QuerySet."""
+
+    def ready(self):
+        """Задачи, которые пора выполнить, в порядке постановки."""
+        return self.filter(
+            status=Task.Status.PENDING,
+            run_after__lte=timezone.now(),
+        ).order_by('run_after', 'pk')
+
+
+class Task(models.Model):
+    """Фоновая задача."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField(
+        max_length=TASK_NAME_MAX_LEN,
+        verbose_name='Задача'
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        verbose_name='Аргументы'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=TASK_MAX_ATTEMPTS,
+        verbose_name='Максимум попыток'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Выполнить не раньше'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начата'
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Завершено'
+    )
+
+    objects = TaskQuerySet.as_manager()
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('status', 'run_after'),
+                name='task_ready_idx',
+            ),
+        )
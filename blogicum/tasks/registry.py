@@ -0,0 +1,137 @@
+"""Регистрация, постановка в очередь и выполнение фоновых задач."""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .constants import TASK_RETRY_DELAY, TASK_RUNNING_TIMEOUT
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(func):
+    """
+    Регистрирует функцию как фоновую задачу.
+
+    Аргументы задачи передаются только по имени и должны сериализоваться
+    в JSON. У функции появляется метод delay для постановки в очередь.
+    """
+    name = f'{func.__module__}.{func.__name__}'
+    _registry[name] = func
+
+    def delay(unique=False, run_after=None, **kwargs):
+        return enqueue(name, unique=unique, run_after=run_after, **kwargs)
+
+    func.task_name = name
+    func.delay = delay
+    return func
+
+
+def enqueue(name, unique=False, run_after=None, **kwargs):
+    """
+    Ставит задачу в очередь.
+
+    Задача выполнится не раньше run_after, если он указан. При unique=True
+    не создаёт дубликат ещё не начатой задачи, а только переносит её
+    на более ранний срок. При TASKS_ALWAYS_EAGER задача выполняется сразу
+    в текущем процессе, а задача на будущее время всё равно ставится
+    в очередь: её выполнит worker или run_tasks --once.
+    """
+    if name not in _registry:
+        raise LookupError(f'Неизвестная задача: {name}')
+    now = timezone.now()
+    run_after = run_after or now
+    if getattr(settings, 'TASKS_ALWAYS_EAGER', False) and run_after <= now:
+        _registry[name](**kwargs)
+        return None
+    if unique:
+        pending = Task.objects.filter(
+            name=name, kwargs=kwargs, status=Task.Status.PENDING
+        ).first()
+        if pending is not None:
+            if run_after < pending.run_after:
+                pending.run_after = run_after
+                pending.save(update_fields=('run_after',))
+            return pending
+    return Task.objects.create(name=name, kwargs=kwargs, run_after=run_after)
+
+
+def claim(task_obj):
+    """Захватывает задачу. Возвращает False, если её взял другой worker."""
+    return bool(
+        Task.objects.filter(
+            pk=task_obj.pk, status=Task.Status.PENDING
+        ).update(
+            status=Task.Status.RUNNING,
+            attempts=task_obj.attempts + 1,
+            started_at=timezone.now(),
+        )
+    )
+
+
+def recover_stale(now=None):
+    """
+    Возвращает в очередь задачи, брошенные упавшим worker.
+
+    Задача считается брошенной, если выполняется дольше
+    TASK_RUNNING_TIMEOUT секунд. Попытка засчитывается: задача без
+    оставшихся попыток помечается ошибкой. Возвращает число задач.
+    """
+    now = now or timezone.now()
+    timeout = getattr(settings, 'TASK_RUNNING_TIMEOUT', TASK_RUNNING_TIMEOUT)
+    stale = Task.objects.filter(status=Task.Status.RUNNING).filter(
+        Q(started_at__lt=now - timedelta(seconds=timeout))
+        | Q(started_at__isnull=True)
+    )
+    error = f'Задача не завершилась за {timeout} с: worker остановлен.'
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.Status.FAILED, finished_at=now, last_error=error
+    )
+    return failed + stale.update(
+        status=Task.Status.PENDING, run_after=now, last_error=error
+    )
+
+
+def run(task_obj):
+    """Выполняет захваченную задачу и сохраняет результат."""
+    task_obj.attempts += 1
+    try:
+        func = _registry[task_obj.name]
+        func(**task_obj.kwargs)
+    except Exception:
+        task_obj.last_error = traceback.format_exc()
+        logger.exception('Задача %s завершилась с ошибкой', task_obj)
+        if task_obj.attempts < task_obj.max_attempts:
+            task_obj.status = Task.Status.PENDING
+            task_obj.run_after = timezone.now() + timedelta(
+                seconds=TASK_RETRY_DELAY * task_obj.attempts
+            )
+        else:
+            task_obj.status = Task.Status.FAILED
+            task_obj.finished_at = timezone.now()
+    else:
+        task_obj.status = Task.Status.DONE
+        task_obj.finished_at = timezone.now()
+    task_obj.save(update_fields=(
+        'status', 'attempts', 'last_error', 'run_after', 'finished_at'
+    ))
+
+
+def run_pending(limit=None):
+    """Выполняет готовые задачи. Возвращает число выполненных."""
+    recover_stale()
+    done = 0
+    while limit is None or done < limit:
+        task_obj = Task.objects.ready().first()
+        if task_obj is None:
+            break
+        if claim(task_obj):
+            run(task_obj)
+            done += 1
+    return done
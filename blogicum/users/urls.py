@@ -1,13 +1,14 @@
 from django.urls import path
 
 from . import views
+from blog.async_views import as_configured_view
 
 app_name = 'users'
 
 urlpatterns = [
     path(
         '<slug:username>/',
-        views.UserProfileView.as_view(),
+        as_configured_view(views.UserProfileView),
         name='profile'),
     path(
         '<slug:username>/edit_profile/',
@@ -1,15 +1,16 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from django.views.generic import CreateView, UpdateView, ListView
 
 from blog.mixins import (
-    UserRedirectMixin, UserProfileMixin, OnlyAuthorMixin
+    CursorPaginationMixin, UserRedirectMixin, UserProfileMixin,
+    OnlyAuthorMixin
 )
 from .forms import ProfileForm
 from blog.constants import POSTS_PER_PAGE
+from blog.models import Post
 
 User = get_user_model()
 
@@ -21,29 +22,35 @@ class UserCreateView(UserRedirectMixin, CreateView):
     form_class = UserCreationForm
 
 
-class UserProfileView(UserProfileMixin, ListView):
+class UserProfileView(CursorPaginationMixin, UserProfileMixin, ListView):
     """Представление для отображения профиля пользователя."""
 
     template_name = 'blog/profile.html'
     paginate_by = POSTS_PER_PAGE
 
-    def get_context_data(self, **kwargs):
+    def get_profile(self):
         """
-        Добавляет данные пользователя в контекст.
+        Возвращает владельца профиля, запрашивая его один раз.
 
         Возвращает 404 если пользователь не найден.
         """
+        if not hasattr(self, 'profile'):
+            self.profile = get_object_or_404(
+                User, username=self.kwargs.get('username')
+            )
+        return self.profile
+
+    def get_context_data(self, **kwargs):
+        """Добавляет данные пользователя в контекст."""
         context = super().get_context_data(**kwargs)
-        user = get_object_or_404(User, username=self.kwargs.get('username'))
-        context['profile'] = user
+        context['profile'] = self.get_profile()
         return context
 
     def get_queryset(self):
         """Добавляет посты связанные с пользователем."""
-        user = get_object_or_404(User, username=self.kwargs.get('username'))
-        queryset = user.posts.all().annotate(comment_count=Count('comments')
-                                             ).order_by('-pub_date')
-        return queryset
+        return Post.objects.with_related_data().filter(
+            author_id=self.get_profile().pk
+        ).order_by('-pub_date')
 
 
 class UserProfileUpdate(
@@ -18,6 +18,7 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db.models import Model, Field
 from django.forms import BaseForm
@@ -41,6 +42,31 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache(tmp_path):
+    """Каждый тест получает пустой файловый кеш во временном каталоге."""
+    location = {"LOCATION": str(tmp_path / "cache")}
+    with override_settings(CACHES={
+        alias: {**options, **location}
+        for alias, options in settings.CACHES.items()
+    }):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def disable_request_metrics():
+    """Буферизованная запись замеров не должна попадать в подсчёт запросов."""
+    with override_settings(METRICS_SAMPLE_RATE=0):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def read_from_default_database():
+    """Тесты, проверяющие чтение с реплики, подключают её явно."""
+    with override_settings(DATABASE_READ_ALIAS="default"):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
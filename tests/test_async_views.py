@@ -0,0 +1,54 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from benchmarks.handlers import async_views, compare_handlers
+from benchmarks.seed import seed
+
+
+@pytest.fixture
+def async_get(settings):
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    client = AsyncClient()
+
+    async def get(url):
+        return await client.get(url)
+
+    with async_views(True):
+        yield async_to_sync(get)
+
+
+@pytest.mark.django_db
+def test_async_views_render_and_serve_cached_pages(
+        async_get, post_with_published_location
+):
+    post = post_with_published_location
+    urls = (
+        "/", f"/posts/{post.id}/", f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        assert asyncio.iscoroutinefunction(resolve(url).func)
+        response = async_get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert post.title in response.content.decode()
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = async_get(urls[1])
+    assert response.status_code == HTTPStatus.OK
+    assert not ctx.captured_queries
+
+
+@pytest.mark.django_db(transaction=True)
+def test_compare_handlers():
+    seed(50)
+    results = compare_handlers(concurrency=20, threads=2)
+    assert set(results) == {"wsgi", "asgi"}
+    for stats in results.values():
+        assert stats["requests"] == 20
+        assert stats["errors"] == 0
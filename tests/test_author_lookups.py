@@ -0,0 +1,61 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count_lookups(client, url, table, method="get", data=None):
+    with CaptureQueriesContext(connection) as ctx:
+        getattr(client, method)(url, data=data)
+    return sum(
+        1 for q in ctx.captured_queries
+        if q["sql"].startswith("SELECT") and f'FROM "{table}"' in q["sql"]
+    )
+
+
+@pytest.mark.parametrize("url", ["/posts/{id}/edit/", "/posts/{id}/delete/"])
+def test_post_author_views_fetch_post_once(
+        user_client, post_with_published_location, url
+):
+    post = post_with_published_location
+    assert _count_lookups(
+        user_client, url.format(id=post.id), "blog_post"
+    ) == 1
+
+
+@pytest.mark.parametrize(
+    "url", ["/posts/{post}/edit_comment/{id}/",
+            "/posts/{post}/delete_comment/{id}/"]
+)
+def test_comment_author_views_fetch_comment_once(
+        mixer, user, user_client, post_with_published_location, url
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    assert _count_lookups(
+        user_client, url.format(post=post.id, id=comment.id), "blog_comment"
+    ) == 1
+
+
+def test_comment_lookup_respects_post(
+        mixer, user, user_client, post_with_published_location,
+        post_with_another_category
+):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    response = user_client.get(
+        f"/posts/{post_with_another_category.id}/edit_comment/{comment.id}/"
+    )
+    assert response.status_code == 404
+
+
+def test_profile_edit_fetches_user_once(user, user_client):
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.get(f"/profile/{user.username}/edit_profile/")
+    lookups = [
+        q for q in ctx.captured_queries
+        if '"auth_user"."username" =' in q["sql"]
+    ]
+    assert len(lookups) == 1
@@ -0,0 +1,36 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from benchmarks.replay import replay
+from benchmarks.seed import seed
+from blog.feed import check
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_seed_keeps_derived_data_consistent():
+    counts = seed(200)
+    assert counts["posts"] == Post.objects.count() == 200
+    assert counts["comments"] == Comment.objects.count()
+    for post in Post.objects.select_related("category")[:50]:
+        assert post.is_visible == post.compute_visibility()
+        assert post.comment_count == post.comments.count()
+    assert check() == ([], [], [])
+
+
+def test_replay_covers_blog_and_users_urls(capsys):
+    seed(200)
+    results = replay(rounds=2)
+    assert {
+        "blog:index", "blog:category_posts", "blog:post_detail",
+        "blog:search", "blog:create_post", "blog:edit_post",
+        "users:profile", "users:edit_profile",
+    } <= set(results)
+    assert results["blog:post_detail"]["statuses"] == [HTTPStatus.OK]
+    assert results["blog:post_detail"]["queries_max"] > 0
+
+    call_command("benchmark", "--rounds", "1")
+    assert "blog:post_detail" in capsys.readouterr().out
@@ -0,0 +1,83 @@
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from blog.feed import check
+from blog.loader import iter_objects, load
+from blog.models import Comment, Post
+from tasks.models import Task
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_iter_objects_reads_in_small_chunks():
+    objects = [{"model": "a", "fields": {"text": "[}, {\"]"}}] * 3
+    for text in (json.dumps(objects, indent=2),
+                 "\n".join(map(json.dumps, objects))):
+        assert list(iter_objects(io.StringIO(text), chunk_size=5)) == objects
+
+
+def test_bulk_loaddata_matches_loaddata(capsys):
+    call_command("bulk_loaddata", str(settings.BASE_DIR / "db.json"))
+    assert "строк/с" in capsys.readouterr().out
+    post = Post.objects.get(pk=1)
+    assert post.title == "Обед"
+    assert post.created_at.year == 2022
+    assert Post.published.exists()
+    assert check() == ([], [], [])
+
+
+def test_dependencies_may_follow_dependents():
+    fixture = [
+        {"model": "blog.comment", "pk": 1, "fields": {
+            "text": "Первый", "post": 1, "author": 1,
+            "created_at": "2023-01-01T00:00:00Z",
+        }},
+        {"model": "blog.post", "pk": 1, "fields": {
+            "title": "Пост", "text": "Текст", "author": 1, "category": 1,
+            "pub_date": "2023-01-01T00:00:00Z", "is_published": True,
+            "created_at": "2023-01-01T00:00:00Z",
+        }},
+        {"model": "blog.category", "pk": 1, "fields": {
+            "title": "Категория", "description": "", "slug": "cat",
+            "is_published": True, "created_at": "2023-01-01T00:00:00Z",
+        }},
+        {"model": "auth.user", "pk": 1, "fields": {
+            "username": "author", "password": "!",
+        }},
+    ]
+    counts, _, _ = load(io.StringIO(json.dumps(fixture)), batch_size=1)
+    assert sum(counts.values()) == 4
+    post = Post.objects.get(pk=1)
+    assert post.is_visible
+    assert post.comment_count == Comment.objects.count() == 1
+
+
+def test_future_post_scheduled_and_cache_reset(
+        client, post_with_published_location
+):
+    category_id = post_with_published_location.category_id
+    author_id = post_with_published_location.author_id
+    assert client.get("/").status_code == HTTPStatus.OK
+    fixture = [
+        {"model": "blog.post", "pk": pk, "fields": {
+            "title": title, "text": "Текст", "author": author_id,
+            "category": category_id, "pub_date": pub_date,
+            "is_published": True, "created_at": "2023-01-01T00:00:00Z",
+        }}
+        for pk, title, pub_date in (
+            (1000, "Загруженный", "2023-01-01T00:00:00Z"),
+            (1001, "Будущий", "2099-01-01T00:00:00Z"),
+        )
+    ]
+    load(io.StringIO(json.dumps(fixture)))
+    task = Task.objects.get(name="blog.tasks.publish_scheduled_posts")
+    assert task.run_after.year == 2099
+    assert not Post.objects.get(pk=1001).is_visible
+    content = client.get("/").content.decode("utf-8")
+    assert "Загруженный" in content
+    assert "Будущий" not in content
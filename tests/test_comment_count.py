@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _stored_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_comment_count_follows_views(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for text in ("first", "second"):
+        response = user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": text}
+        )
+        assert response.status_code == HTTPStatus.FOUND
+    assert _stored_count(post) == 2
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert _stored_count(post) == 1
+
+
+def test_comment_count_after_bulk_delete(
+        mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    assert _stored_count(post) == 5
+    Comment.objects.filter(post=post).delete()
+    assert _stored_count(post) == 0
+
+
+def test_recount_comments_command(
+        mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    call_command("recount_comments")
+    assert _stored_count(post) == 3
@@ -0,0 +1,57 @@
+import re
+from http import HTTPStatus
+
+import pytest
+
+from blog.constants import COMMENTS_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+NEXT_LINK = re.compile(r'data-comments-next="([^"]+)"')
+
+
+@pytest.fixture
+def comments(mixer, post_with_published_location):
+    return mixer.cycle(COMMENTS_PER_PAGE * 2 + 5).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+
+
+def _next_url(response):
+    match = NEXT_LINK.search(response.content.decode("utf-8"))
+    return match and match.group(1).replace("&amp;", "&")
+
+
+def test_comments_load_page_by_page(client, comments):
+    post = comments[0].post
+    response = client.get(f"/posts/{post.id}/")
+    seen = list(response.context["comments"])
+    assert len(seen) == COMMENTS_PER_PAGE
+    url = _next_url(response)
+    while url:
+        assert url.startswith(f"/posts/{post.id}/comments/")
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert "<html" not in response.content.decode("utf-8")
+        seen.extend(response.context["comments"])
+        url = _next_url(response)
+    expected = sorted(comments, key=lambda c: (c.created_at, c.pk))
+    assert [c.pk for c in seen] == [c.pk for c in expected]
+
+
+def test_comment_fragment_bad_cursor(client, post_with_published_location):
+    response = client.get(
+        f"/posts/{post_with_published_location.id}/comments/",
+        {"cursor": "broken"},
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_comment_fragment_hidden_post(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _walk_forward(client, url):
+    seen = []
+    response = client.get(url, {"cursor": ""})
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        seen.extend(page.object_list)
+        if not page.has_next():
+            return seen, page
+        response = client.get(url, {"cursor": page.next_cursor})
+
+
+def test_cursor_pagination_walks_whole_feed(
+        user_client, many_posts_with_published_locations
+):
+    seen, last_page = _walk_forward(user_client, "/")
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.pk),
+        reverse=True,
+    )
+    assert [post.pk for post in seen] == [post.pk for post in expected]
+
+    response = user_client.get(
+        "/", {"cursor": last_page.previous_cursor}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context["page_obj"]) == expected[:N_PER_PAGE]
+
+
+def test_cursor_pagination_on_profile_and_category(
+        user, user_client, published_category,
+        many_posts_with_published_locations
+):
+    for url in (
+        f"/profile/{user.username}/",
+        f"/category/{published_category.slug}/",
+    ):
+        seen, _ = _walk_forward(user_client, url)
+        assert len(seen) == len(many_posts_with_published_locations)
+
+
+def test_cursor_pagination_skips_count(
+        user_client, many_posts_with_published_locations
+):
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.get("/", {"cursor": ""})
+    assert not any("COUNT(*)" in q["sql"] for q in ctx.captured_queries)
+
+
+def test_cursor_pagination_bad_token(user_client):
+    response = user_client.get("/", {"cursor": "garbage"})
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,30 @@
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+DETAIL_QUERIES = 2
+SESSION_AND_USER_QUERIES = 2
+
+
+@pytest.mark.parametrize("n_comments", [0, 1, 10])
+def test_post_detail_query_count(
+        mixer, client, post_with_published_location,
+        django_assert_num_queries, n_comments
+):
+    post = post_with_published_location
+    mixer.cycle(n_comments).blend("blog.Comment", post=post)
+    call_command("run_tasks", "--once")
+    with django_assert_num_queries(DETAIL_QUERIES):
+        client.get(f"/posts/{post.id}/")
+
+
+def test_post_detail_query_count_for_author(
+        mixer, user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post, author=post.author)
+    call_command("run_tasks", "--once")
+    with django_assert_num_queries(DETAIL_QUERIES + SESSION_AND_USER_QUERIES):
+        user_client.get(f"/posts/{post.id}/")
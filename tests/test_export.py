@@ -0,0 +1,66 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, location=None, pub_date=timezone.now(),
+    )
+    mixer.cycle(2).blend("blog.Comment", post=posts[0], author=user)
+    return posts
+
+
+def _lines(content):
+    return [json.loads(line) for line in content.splitlines()]
+
+
+def test_export_endpoint_streams_and_resumes(
+        posts, client, admin_client
+):
+    assert client.get("/export/posts/").status_code == HTTPStatus.FOUND
+    response = admin_client.get("/export/posts/")
+    assert response.streaming
+    rows = _lines(b"".join(response.streaming_content).decode())
+    assert [row["id"] for row in rows] == sorted(p.id for p in posts)
+
+    response = admin_client.get(f"/export/posts/?after={rows[2]['id']}")
+    resumed = _lines(b"".join(response.streaming_content).decode())
+    assert resumed == rows[3:]
+
+    response = admin_client.get("/export/comments/")
+    comments = _lines(b"".join(response.streaming_content).decode())
+    assert {row["post_id"] for row in comments} == {posts[0].id}
+    assert admin_client.get("/export/users/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_export_command_checkpoint(posts, tmp_path):
+    output, checkpoint = tmp_path / "posts.ndjson", tmp_path / "checkpoint"
+    checkpoint.write_text(str(posts[1].id))
+    call_command(
+        "export_ndjson", "posts", "--output", str(output),
+        "--checkpoint", str(checkpoint), "--chunk-size", "2",
+    )
+    rows = _lines(output.read_text())
+    assert [row["id"] for row in rows] == [p.id for p in posts[2:]]
+    assert checkpoint.read_text() == str(posts[-1].id)
+
+
+def test_export_command_after_overwrites_output(posts, tmp_path):
+    output = tmp_path / "posts.ndjson"
+    for _ in range(2):
+        call_command(
+            "export_ndjson", "posts", "--output", str(output),
+            "--after", str(posts[1].id),
+        )
+    rows = _lines(output.read_text())
+    assert [row["id"] for row in rows] == [p.id for p in posts[2:]]
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import feed
+from blog.models import Category, FeedEntry, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _entry(post):
+    return FeedEntry.objects.get(pk=post.pk)
+
+
+def test_signals_keep_feed_in_sync(
+        mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    entry = _entry(post)
+    assert entry.author_username == user.username
+    assert entry.location_name == post.location.name
+
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    assert _entry(post).comment_count == 2
+
+    user.username = "renamed"
+    user.save()
+    assert _entry(post).author_username == "renamed"
+
+    post.location.is_published = False
+    post.location.save()
+    assert _entry(post).location_name == ""
+
+    post.category.title = "Новое название"
+    post.category.save()
+    assert _entry(post).category_title == "Новое название"
+
+    post.category.is_published = False
+    post.category.save()
+    assert not FeedEntry.objects.filter(pk=post.pk).exists()
+    assert feed.check() == ([], [], [])
+
+
+def test_check_feed_command(post_with_published_location):
+    post = post_with_published_location
+    FeedEntry.objects.filter(pk=post.pk).update(title="stale")
+    with pytest.raises(CommandError):
+        call_command("check_feed")
+    assert feed.check() == ([], [], [post.pk])
+    call_command("check_feed", "--fix")
+    assert feed.check() == ([], [], [])
+
+    FeedEntry.objects.all().delete()
+    call_command("rebuild_feed")
+    assert _entry(post).title == post.title
+
+
+def test_feed_read_model_is_single_table(
+        settings, client, post_with_published_location
+):
+    settings.BLOG_FEED_READ_MODEL = True
+    post = post_with_published_location
+    category = Category.objects.get(pk=post.category_id)
+    for url in ("/", f"/category/{category.slug}/"):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert post.title in response.content.decode()
+        feed_queries = [
+            q["sql"] for q in ctx.captured_queries
+            if "blog_feedentry" in q["sql"]
+        ]
+        assert feed_queries
+        assert not any("JOIN" in sql for sql in feed_queries)
+
+
+def test_loaddata_refreshes_visibility_and_feed():
+    call_command("loaddata", Path(settings.BASE_DIR).parent / "db.json")
+    expected = {
+        post.pk for post in Post.objects.select_related("category")
+        if post.compute_visibility()
+    }
+    assert expected
+    assert set(Post.published.values_list("pk", flat=True)) == expected
+    assert feed.check() == ([], [], [])
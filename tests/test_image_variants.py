@@ -0,0 +1,113 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.files.images import ImageFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+
+from blog.images import variant_name
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def _image_file(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(73, 109, 137)).save(
+        buffer, format="JPEG"
+    )
+    return ImageFile(buffer, name="wide.jpg")
+
+
+@pytest.fixture
+def post_with_wide_image(mixer, user, published_category, published_location):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, image=_image_file(1000, 500),
+    )
+    call_command("run_tasks", "--once")
+    return post
+
+
+def test_variants_created_on_save(post_with_wide_image):
+    storage = post_with_wide_image.image.storage
+    name = post_with_wide_image.image.name
+    for width in (320, 640):
+        with storage.open(variant_name(name, width)) as variant:
+            assert Image.open(variant).width == width
+    assert not storage.exists(variant_name(name, 1280))
+
+
+def test_exif_stripped_without_recompression(mixer, user, media_root):
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = "Camera"
+    buffer = BytesIO()
+    Image.new("RGB", (400, 300), color=(73, 109, 137)).save(
+        buffer, format="JPEG", quality=95, exif=exif, icc_profile=b"icc"
+    )
+    post = mixer.blend(
+        "blog.Post", author=user, image=ImageFile(buffer, name="exif.jpg")
+    )
+    with post.image.storage.open(post.image.name) as original:
+        quantization = Image.open(original).quantization
+    call_command("run_tasks", "--once")
+    with post.image.storage.open(post.image.name) as original:
+        image = Image.open(original)
+        assert dict(image.getexif()) == {0x0112: 6}
+        assert image.info["icc_profile"] == b"icc"
+        assert image.quantization == quantization
+    assert sorted(
+        path.name for path in (media_root / "birthdays_images").iterdir()
+        if "_320w" not in path.name
+    ) == ["exif.jpg"]
+
+
+def test_narrow_image_srcset_uses_real_width(
+        mixer, client, user, published_category, published_location
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, image=_image_file(200, 100),
+    )
+    call_command("run_tasks", "--once")
+    content = client.get(f"/posts/{post.id}/").content.decode("utf-8")
+    assert f"{variant_name(post.image.name, 320)} 200w" in content
+
+
+def test_srcset_does_not_touch_storage(
+        client, monkeypatch, post_with_wide_image
+):
+    monkeypatch.setattr(
+        FileSystemStorage, "exists", lambda *args: pytest.fail("exists()")
+    )
+    assert "320w" in client.get("/").content.decode("utf-8")
+
+
+def test_srcset_rendered(client, post_with_wide_image):
+    name = post_with_wide_image.image.name
+    for url in ("/", f"/posts/{post_with_wide_image.id}/"):
+        content = client.get(url).content.decode("utf-8")
+        assert f"{variant_name(name, 320)} 320w" in content
+        assert f"{variant_name(name, 640)} 640w" in content
+
+
+def test_variants_queued_on_first_display(client, post_with_wide_image):
+    storage = post_with_wide_image.image.storage
+    name = post_with_wide_image.image.name
+    url = f"/posts/{post_with_wide_image.id}/"
+    storage.delete(variant_name(name, 320))
+    Post.objects.filter(pk=post_with_wide_image.pk).update(image_variants={})
+    assert "srcset" not in client.get(url).content.decode("utf-8")
+    call_command("run_tasks", "--once")
+    assert storage.exists(variant_name(name, 320))
+    assert f"{variant_name(name, 320)} 320w" in (
+        client.get(url).content.decode("utf-8")
+    )
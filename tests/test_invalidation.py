@@ -0,0 +1,96 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.cache import get_versions, post_version
+from blog.feed import check
+from blog.invalidation import set_published
+from blog.models import Category, FeedEntry, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, another_category,
+          published_location):
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=category,
+            location=published_location, is_published=True,
+            pub_date=timezone.now(),
+        )
+        for category in (published_category, another_category)
+    ]
+
+
+def _version(post):
+    return get_versions([post_version(post.pk)])[0]
+
+
+def _visible_ids():
+    return set(Post.published.values_list("pk", flat=True))
+
+
+def test_untracked_change_touches_nothing(
+        django_assert_max_num_queries, posts, published_category
+):
+    version = _version(posts[0])
+    published_category.description = "Другое описание"
+    with django_assert_max_num_queries(2):
+        published_category.save()
+    assert _version(posts[0]) == version
+
+
+def test_category_unpublish_cascades(posts, published_category):
+    inside, outside = posts
+    versions = _version(inside), _version(outside)
+    published_category.is_published = False
+    published_category.save()
+    assert _visible_ids() == {outside.pk}
+    assert not FeedEntry.objects.filter(pk=inside.pk).exists()
+    assert _version(inside) != versions[0]
+    assert _version(outside) == versions[1]
+    assert check() == ([], [], [])
+
+
+def test_bulk_set_published(posts):
+    assert set_published(Category.objects.all(), False) == 2
+    assert _visible_ids() == set()
+    assert set_published(Category.objects.all(), True) == 2
+    assert _visible_ids() == {post.pk for post in posts}
+    assert check() == ([], [], [])
+
+
+def test_location_unpublish_cascades(posts, published_location):
+    versions = [_version(post) for post in posts]
+    assert set_published(Location.objects.all(), False) == 1
+    assert not FeedEntry.objects.exclude(location_name="").exists()
+    assert all(
+        _version(post) != version for post, version in zip(posts, versions)
+    )
+    assert check() == ([], [], [])
+
+
+def test_publication_actions_need_change_permission(mixer, client):
+    staff = mixer.blend("auth.User", is_staff=True)
+    staff.user_permissions.add(
+        Permission.objects.get(codename="view_category")
+    )
+    client.force_login(staff)
+    response = client.get("/admin/blog/category/")
+    assert response.status_code == 200
+    assert not response.context["cl"].model_admin.get_actions(
+        response.wsgi_request
+    )
+
+
+def test_post_delete_resets_cache_once(mixer, posts):
+    post = posts[0]
+    mixer.cycle(20).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as queries:
+        post.delete()
+    assert sum(
+        "blog_category" in query["sql"] for query in queries.captured_queries
+    ) == 1
@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from metrics import recorder
+from metrics.models import RequestSample
+from metrics.stats import percentile
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def flush_every_request(settings):
+    settings.METRICS_SAMPLE_RATE = 1.0
+    settings.METRICS_FLUSH_SIZE = 1
+    recorder.flush()
+    RequestSample.objects.all().delete()
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 90) == 7
+    assert percentile([], 50) is None
+
+
+def test_middleware_records_named_views(client, post_with_published_location):
+    client.get("/")
+    client.get(f"/posts/{post_with_published_location.id}/")
+    client.get("/pages/about/")
+    client.get("/auth/login/")
+    samples = {s.url_name: s for s in RequestSample.objects.all()}
+    assert set(samples) == {"blog:index", "blog:post_detail", "pages:about"}
+    index = samples["blog:index"]
+    assert index.status == HTTPStatus.OK
+    assert index.query_count > 0
+    assert index.template_time > 0
+    assert index.response_size > 0
+
+
+def test_metrics_endpoint_is_staff_only(client, admin_client, user_client):
+    client.get("/")
+    assert client.get("/metrics/").status_code == HTTPStatus.FOUND
+    assert user_client.get("/metrics/").status_code == HTTPStatus.FOUND
+    response = admin_client.get("/metrics/")
+    assert response.status_code == HTTPStatus.OK
+    stats = response.json()["blog:index"]
+    assert stats["count"] == 1
+    assert set(stats["query_count"]) == {"p50", "p90", "p99"}
+
+
+def test_request_metrics_command(client, capsys):
+    client.get("/")
+    call_command("request_metrics", "--url-name", "blog:index", "--prune")
+    assert "blog:index" in capsys.readouterr().out
@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.feed import check
+from blog.models import Comment, FeedEntry, Post
+from blog.moderation import delete_comments, purge_comments, set_published
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELIST_URL = "/admin/blog/comment/"
+
+
+@pytest.fixture
+def comments(mixer, user, another_user, post_with_published_location):
+    return [
+        mixer.blend(
+            "blog.Comment", post=post_with_published_location, author=author
+        )
+        for author in (user, user, another_user)
+    ]
+
+
+def _comment_count(post):
+    return Post.objects.get(pk=post.pk).comment_count
+
+
+def test_hide_and_publish_keep_counts(comments):
+    post = comments[0].post
+    assert set_published(
+        Comment.objects.filter(pk=comments[0].pk), False
+    ) == 1
+    assert _comment_count(post) == 2
+    assert FeedEntry.objects.get(pk=post.pk).comment_count == 2
+    assert set_published(Comment.objects.all(), True) == 1
+    assert _comment_count(post) == 3
+    assert check() == ([], [], [])
+
+
+def test_hidden_comment_not_shown(client, comments):
+    comment = comments[0]
+    comment.is_published = False
+    comment.save()
+    assert _comment_count(comment.post) == 2
+    response = client.get(f"/posts/{comment.post_id}/")
+    assert comment not in response.context["comments"]
+
+
+def test_delete_and_purge(comments, user, another_user):
+    post = comments[0].post
+    assert delete_comments(Comment.objects.filter(author=another_user)) == 1
+    assert _comment_count(post) == 2
+    assert purge_comments(authors=[user]) == 2
+    assert _comment_count(post) == 0
+    assert check() == ([], [], [])
+    with pytest.raises(ValueError):
+        purge_comments()
+
+
+def test_purge_command_by_date(comments):
+    Comment.objects.filter(pk=comments[0].pk).update(
+        created_at=timezone.now() - timedelta(days=10)
+    )
+    since = (timezone.now() - timedelta(days=1)).date().isoformat()
+    call_command("purge_comments", "--since", since)
+    assert list(Comment.objects.all()) == [comments[0]]
+    assert _comment_count(comments[0].post) == 1
+
+
+def test_admin_actions(admin_client, comments, user):
+    data = {"action": "purge_authors", "_selected_action": [comments[0].pk]}
+    response = admin_client.post(CHANGELIST_URL, data)
+    assert response.status_code == 200
+    assert response.context["purge_count"] == 2
+    assert Comment.objects.filter(author=user).count() == 2
+    response = admin_client.post(CHANGELIST_URL, {**data, "post": "yes"})
+    assert response.status_code == 302
+    assert not Comment.objects.filter(author=user).exists()
+    admin_client.post(CHANGELIST_URL, {
+        "action": "delete_selected",
+        "_selected_action": [comments[2].pk],
+        "post": "yes",
+    })
+    assert not Comment.objects.exists()
+    assert _comment_count(comments[0].post) == 0
+
+
+def test_changelist_query_count_is_constant(
+        mixer, admin_client, post_with_published_location
+):
+    def changelist_queries():
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get(CHANGELIST_URL)
+        return len(context)
+
+    mixer.cycle(2).blend("blog.Comment", post=post_with_published_location)
+    few = changelist_queries()
+    mixer.cycle(20).blend("blog.Comment", post=post_with_published_location)
+    assert changelist_queries() == few
+
+
+def test_view_only_staff_has_no_moderation_actions(
+        mixer, client, comments
+):
+    staff = mixer.blend("auth.User", is_staff=True)
+    staff.user_permissions.add(
+        Permission.objects.get(codename="view_comment")
+    )
+    client.force_login(staff)
+    response = client.get(CHANGELIST_URL)
+    assert response.status_code == 200
+    assert not response.context["cl"].model_admin.get_actions(
+        response.wsgi_request
+    )
+
+
+def test_delete_skips_per_comment_handlers(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(30).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as queries:
+        assert delete_comments(Comment.objects.all()) == 30
+    assert len(queries.captured_queries) < 20
+    assert _comment_count(post) == 0
+    assert check() == ([], [], [])
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.cache import feed_cache_timeout
+from blog.constants import PAGE_CACHE_TIMEOUT
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize(
+    "url", ["/", "/posts/{id}/", "/category/{slug}/", "/pages/about/"]
+)
+def test_anonymous_pages_are_cached(
+        client, post_with_published_location, url
+):
+    post = post_with_published_location
+    url = url.format(id=post.id, slug=post.category.slug)
+    first, _ = _get(client, url)
+    second, queries = _get(client, url)
+    assert queries == 0
+    assert second.content == first.content
+
+
+def test_logged_in_pages_are_not_cached(
+        user_client, post_with_published_location
+):
+    _get(user_client, "/")
+    _, queries = _get(user_client, "/")
+    assert queries > 0
+
+
+@pytest.mark.parametrize("change", ["post", "comment", "category"])
+def test_page_cache_invalidated(
+        mixer, client, post_with_published_location, change
+):
+    post = post_with_published_location
+    urls = ("/", f"/posts/{post.id}/")
+    for url in urls:
+        client.get(url)
+    if change == "post":
+        post.title = "Новый заголовок"
+        post.save()
+        expected = post.title
+    elif change == "comment":
+        mixer.blend("blog.Comment", post=post)
+        expected = "Комментарии (1)"
+    else:
+        post.category.title = "Новая категория"
+        post.category.save()
+        expected = post.category.title
+    assert expected in client.get("/").content.decode("utf-8")
+    if change != "comment":
+        detail = client.get(f"/posts/{post.id}/").content.decode("utf-8")
+        assert expected in detail
+
+
+def test_feed_cache_expires_with_next_publication(
+        mixer, user, published_category
+):
+    assert feed_cache_timeout() == PAGE_CACHE_TIMEOUT
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    assert 29 <= feed_cache_timeout() <= 30
+
+
+def test_only_affected_category_pages_invalidated(
+        mixer, client, post_with_published_location, another_category
+):
+    post = post_with_published_location
+    other = mixer.blend(
+        "blog.Post", author=post.author, category=another_category,
+        is_published=True, pub_date=timezone.now(),
+    )
+    own_url = f"/category/{post.category.slug}/"
+    other_url = f"/category/{another_category.slug}/"
+    for url in (own_url, other_url):
+        client.get(url)
+    mixer.blend("blog.Comment", post=post)
+    assert _get(client, other_url)[1] == 0
+    assert _get(client, own_url)[1] > 0
+
+    other.category = post.category
+    other.save()
+    assert _get(client, other_url)[1] > 0
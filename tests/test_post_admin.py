@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.constants import ADMIN_INLINE_PER_PAGE
+from blog.models import Post
+from blog.paginators import EstimatedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELIST_URL = "/admin/blog/post/"
+
+
+def _queries(client, url, data=None):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, data)
+    assert response.status_code == HTTPStatus.OK
+    return response, context.captured_queries
+
+
+def test_comment_inline_is_paginated(
+        mixer, admin_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"{CHANGELIST_URL}{post.pk}/change/"
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    # Первый запрос заполняет кеш типов содержимого.
+    admin_client.get(url)
+    _, few = _queries(admin_client, url)
+    mixer.cycle(ADMIN_INLINE_PER_PAGE * 2).blend("blog.Comment", post=post)
+    response, many = _queries(admin_client, url)
+    assert len(many) == len(few)
+    formset = response.context["inline_admin_formsets"][0].formset
+    assert len(formset.forms) == ADMIN_INLINE_PER_PAGE
+    assert "comments_page=2" in formset.next_page_url()
+
+    response, _ = _queries(admin_client, url, {"comments_page": 3})
+    formset = response.context["inline_admin_formsets"][0].formset
+    assert len(formset.forms) == 3
+
+
+def test_changelist_estimates_unfiltered_count(
+        monkeypatch, admin_client, post_with_published_location
+):
+    monkeypatch.setattr("blog.paginators.ESTIMATED_COUNT_THRESHOLD", 0)
+    response, queries = _queries(admin_client, CHANGELIST_URL)
+    assert not any("COUNT(*)" in query["sql"] for query in queries)
+    assert response.context["cl"].result_count == (
+        post_with_published_location.pk
+    )
+
+    response, queries = _queries(
+        admin_client, CHANGELIST_URL, {"is_published__exact": "1"}
+    )
+    assert response.context["cl"].result_count == 1
+    assert response.context["cl"].full_result_count is None
+
+
+def test_category_autocomplete(admin_client, published_category):
+    response = admin_client.get("/admin/autocomplete/", {
+        "app_label": "blog",
+        "model_name": "post",
+        "field_name": "category",
+        "term": published_category.title[:3],
+    })
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["results"][0]["id"] == str(published_category.pk)
+
+
+@pytest.mark.parametrize("relation", ["category", "location"])
+def test_post_inline_is_bounded(
+        mixer, admin_client, user, published_category, published_location,
+        relation
+):
+    owner = {
+        "category": published_category, "location": published_location,
+    }[relation]
+    url = f"/admin/blog/{relation}/{owner.pk}/change/"
+
+    def blend_posts(count):
+        mixer.cycle(count).blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location,
+        )
+
+    blend_posts(2)
+    admin_client.get(url)
+    _, few = _queries(admin_client, url)
+    blend_posts(ADMIN_INLINE_PER_PAGE * 2)
+    response, many = _queries(admin_client, url)
+    assert len(many) == len(few)
+    formset = response.context["inline_admin_formsets"][0].formset
+    assert len(formset.forms) == ADMIN_INLINE_PER_PAGE
+    changelist = f"{CHANGELIST_URL}?{relation}__id__exact={owner.pk}"
+    assert changelist in response.content.decode("utf-8")
+    response = admin_client.get(changelist)
+    assert response.context["cl"].result_count == ADMIN_INLINE_PER_PAGE * 2 + 2
+
+
+def test_estimated_count_corrected_by_empty_page(
+        monkeypatch, mixer, user, published_category
+):
+    monkeypatch.setattr("blog.paginators.ESTIMATED_COUNT_THRESHOLD", 0)
+    monkeypatch.setattr("blog.paginators.estimate_count", lambda qs: 100)
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    paginator = EstimatedCountPaginator(Post.objects.order_by("pk"), 2)
+    assert paginator.num_pages == 50
+    page = paginator.page(10)
+    assert page.number == 3
+    assert list(page) == posts[4:]
+    assert (paginator.count, paginator.num_pages) == (5, 3)
+
+    paginator = EstimatedCountPaginator(Post.objects.order_by("pk"), 2)
+    assert list(paginator.page(3)) == posts[4:]
+    assert paginator.count == 5
@@ -0,0 +1,47 @@
+import pytest
+from django.core.cache import cache
+
+from blog.cache import post_card_cache_key
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _index_content(client):
+    return client.get("/").content.decode("utf-8")
+
+
+def test_post_card_is_cached(user_client, post_with_published_location):
+    post = post_with_published_location
+    _index_content(user_client)
+    assert post.title in cache.get(post_card_cache_key(post.pk))
+
+
+@pytest.mark.parametrize("change", ["post", "category", "location", "author"])
+def test_post_card_invalidated_on_change(
+        user_client, post_with_published_location, change
+):
+    post = post_with_published_location
+    _index_content(user_client)
+    new_value = f"changed-{change}"
+    if change == "post":
+        post.title = new_value
+        post.save()
+    elif change == "category":
+        post.category.title = new_value
+        post.category.save()
+    elif change == "location":
+        post.location.name = new_value
+        post.location.save()
+    else:
+        post.author.username = new_value
+        post.author.save()
+    assert new_value in _index_content(user_client)
+
+
+def test_post_card_invalidated_on_comment(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert "Комментарии (0)" in _index_content(user_client)
+    mixer.blend("blog.Comment", post=post)
+    assert "Комментарии (1)" in _index_content(user_client)
@@ -0,0 +1,33 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _profile_queries(client, username):
+    call_command("run_tasks", "--once")
+    cache.clear()
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"/profile/{username}/")
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+def test_profile_query_count_is_constant(
+        mixer, client, user, published_category, published_location
+):
+    counts = []
+    for n_posts in (1, N_PER_PAGE // 2, N_PER_PAGE):
+        mixer.cycle(n_posts - user.posts.count()).blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location,
+        )
+        counts.append(_profile_queries(client, user.username))
+    assert len(set(counts)) == 1, (
+        f"Число запросов растёт вместе с числом постов: {counts}"
+    )
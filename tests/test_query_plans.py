@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+
+from blog.models import Category, Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Проверка плана запроса написана для SQLite.",
+    ),
+]
+
+HOT_TABLES = ("blog_post", "blog_comment")
+
+
+def _plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def _assert_no_full_scan(queryset, name):
+    plan = _plan(queryset)
+    for step in plan:
+        for table in HOT_TABLES:
+            assert not (
+                step.startswith(f"SCAN {table}")
+                and "USING" not in step
+            ), f"Запрос `{name}` читает `{table}` полным сканированием: {plan}"
+
+
+def test_hot_queries_use_indexes(user, published_category):
+    hot_queries = {
+        "feed": Post.published.all(),
+        "category": published_category.posts(manager="published").all(),
+        "location": Post.published.filter(location_id=1),
+        "profile": Post.objects.filter(author=user).order_by("-pub_date"),
+        "comments": Comment.objects.filter(post_id=1).order_by("created_at"),
+        "category_lookup": Category.objects.filter(
+            slug=published_category.slug, is_published=True
+        ),
+    }
+    for name, queryset in hot_queries.items():
+        _assert_no_full_scan(queryset, name)
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from blog.models import Comment
+from core.ratelimit import take_token, take_tokens
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_token_bucket_refills():
+    assert take_token("bucket", 2, 10, now=0) == 0
+    assert take_token("bucket", 2, 10, now=0) == 0
+    assert take_token("bucket", 2, 10, now=1) == pytest.approx(4)
+    assert take_token("bucket", 2, 10, now=5) == 0
+
+
+def test_rejected_request_keeps_other_buckets():
+    buckets = [("user", 1, 60), ("ip", 2, 60)]
+    assert take_tokens(buckets, now=0) == 0
+    assert take_tokens(buckets, now=0) == pytest.approx(60)
+    assert take_token("ip", 2, 60, now=0) == 0
+    assert take_token("ip", 2, 60, now=0) > 0
+
+
+@override_settings(RATE_LIMITS={"blog:add_comment": {"user": (2, 60)}})
+def test_comments_limited_per_user(
+        user_client, another_user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/comment/"
+    for _ in range(2):
+        response = user_client.post(url, {"text": "Комментарий"})
+        assert response.status_code == HTTPStatus.FOUND
+    response = user_client.post(url, {"text": "Лишний"})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response["Retry-After"]) > 0
+    response = another_user_client.post(url, {"text": "Другой автор"})
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.count() == 3
+
+
+@override_settings(RATE_LIMITS={"login": {"ip": (1, 60)}})
+def test_login_limited_per_ip(client):
+    credentials = {"username": "nobody", "password": "wrong"}
+    assert client.post("/auth/login/", credentials).status_code == (
+        HTTPStatus.OK
+    )
+    assert client.post("/auth/login/", credentials).status_code == (
+        HTTPStatus.TOO_MANY_REQUESTS
+    )
+    assert client.get("/auth/login/").status_code == HTTPStatus.OK
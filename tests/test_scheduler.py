@@ -0,0 +1,88 @@
+from datetime import timedelta
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.tasks import publish_scheduled_posts
+from tasks.models import Task
+from tasks.registry import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def _visible(post):
+    return Post.published.filter(pk=post.pk).exists()
+
+
+def test_scheduled_post_enqueues_tick(scheduled_post):
+    task_obj = Task.objects.get(name=publish_scheduled_posts.task_name)
+    assert task_obj.run_after == scheduled_post.pub_date
+    assert not _visible(scheduled_post)
+
+
+def test_tick_publishes_due_post(client, scheduled_post):
+    assert scheduled_post.title not in client.get("/").content.decode()
+    Post.objects.filter(pk=scheduled_post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    Task.objects.update(run_after=timezone.now())
+    run_pending()
+    assert _visible(scheduled_post)
+    assert scheduled_post.title in client.get("/").content.decode()
+
+
+def test_publish_scheduled_command(scheduled_post):
+    Post.objects.filter(pk=scheduled_post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    call_command("publish_scheduled")
+    assert _visible(scheduled_post)
+
+
+def test_category_toggle_updates_visibility(post_with_published_location):
+    post = post_with_published_location
+    assert _visible(post)
+    post.category.is_published = False
+    post.category.save()
+    assert not _visible(post)
+    post.category.is_published = True
+    post.category.save()
+    assert _visible(post)
+
+
+def test_deleted_category_hides_posts(post_with_published_location):
+    post = post_with_published_location
+    post.category.delete()
+    assert not _visible(post)
+
+
+def test_migration_schedules_existing_posts(scheduled_post):
+    migration = import_module("blog.migrations.0017_schedule_publication")
+    Task.objects.all().delete()
+    migration.schedule_publication(apps, None)
+    migration.schedule_publication(apps, None)
+    task_obj = Task.objects.get(name=publish_scheduled_posts.task_name)
+    assert task_obj.run_after == scheduled_post.pub_date
+
+
+def test_eager_mode_keeps_future_tick(settings, mixer, user,
+                                      published_category):
+    settings.TASKS_ALWAYS_EAGER = True
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    task_obj = Task.objects.get(name=publish_scheduled_posts.task_name)
+    assert task_obj.run_after == post.pub_date
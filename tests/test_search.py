@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from blog import search
+from tasks.models import Task
+from tasks.registry import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=["fts", "tokens"])
+def search_backend(request, monkeypatch):
+    if request.param == "fts":
+        if not search.fts_available():
+            pytest.skip("SQLite собран без FTS5.")
+    else:
+        monkeypatch.setattr(search, "fts_available", lambda: False)
+    return request.param
+
+
+def _found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == HTTPStatus.OK
+    return list(response.context["page_obj"])
+
+
+def test_search_ranks_title_matches_first(
+        search_backend, mixer, client, user, published_category
+):
+    in_text = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Заметка", text="про Лыжный поход",
+    )
+    in_title = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Лыжный поход", text="Заметка",
+    )
+    assert _found(client, "лыжный ПОХОД") == [in_title, in_text]
+    assert _found(client, "лыжный самолёт") == []
+
+
+def test_search_only_published(
+        search_backend, mixer, client, user, published_category
+):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="скрытый", is_published=False,
+    )
+    assert _found(client, "скрытый") == []
+
+
+def test_search_follows_comments_and_edits(
+        search_backend, mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, text="уникальнослово")
+    mixer.blend("blog.Comment", post=post, text="другоеслово")
+    assert Task.objects.filter(name="blog.tasks.reindex_post").count() == 1
+    assert _found(client, "уникальнослово") == []
+    run_pending()
+    assert _found(client, "уникальнослово") == [post]
+
+    post.title = "переименованный"
+    post.save()
+    assert _found(client, "переименованный") == [post]
+
+    post.delete()
+    assert _found(client, "уникальнослово") == []
+
+
+def test_rebuild_search_index(
+        search_backend, client, post_with_published_location
+):
+    search.get_backend().clear()
+    call_command("rebuild_search_index")
+    title_word = search.tokenize(post_with_published_location.title)[0]
+    assert post_with_published_location in _found(client, title_word)
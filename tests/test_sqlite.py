@@ -0,0 +1,47 @@
+import pytest
+from django.db import OperationalError, connection, connections, transaction
+from django.db import router
+from django.test import override_settings
+
+from benchmarks.seed import seed
+from benchmarks.sqlite import contention
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_on_connect():
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        assert cursor.fetchone() == (5000,)
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone() == (1,)
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_reads_go_to_read_only_replica(user):
+    with override_settings(DATABASE_READ_ALIAS="replica"):
+        assert router.db_for_read(Post) == "replica"
+        assert router.db_for_write(Post) == "default"
+        with transaction.atomic():
+            assert router.db_for_read(Post) == "default"
+        assert Post.objects.all().db == "replica"
+        with pytest.raises(OperationalError):
+            with connections["replica"].cursor() as cursor:
+                cursor.execute(
+                    "UPDATE auth_user SET username = 'other' WHERE id = %s",
+                    [user.pk],
+                )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_contention_reports_both_profiles():
+    seed(100)
+    comments = Comment.objects.count()
+    results = contention(writers=1, readers=2, seconds=0.2)
+    assert set(results) == {"default", "tuned"}
+    written = 0
+    for roles in results.values():
+        assert set(roles) == {"writers", "readers"}
+        written += roles["writers"]["operations"]
+        assert roles["readers"]["operations"] + roles["readers"]["errors"]
+    assert Comment.objects.count() == comments + written
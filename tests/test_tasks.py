@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.registry import enqueue, run_pending, task
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@task
+def record_call(value):
+    calls.append(value)
+
+
+@task
+def always_fails():
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_task_runs_in_worker():
+    record_call.delay(value=1)
+    assert calls == []
+    assert run_pending() == 1
+    assert calls == [1]
+    assert Task.objects.get().status == Task.Status.DONE
+
+
+def test_unique_task_not_duplicated():
+    first = record_call.delay(unique=True, value=2)
+    second = record_call.delay(unique=True, value=2)
+    assert first.pk == second.pk
+    record_call.delay(unique=True, value=3)
+    assert Task.objects.count() == 2
+
+
+def test_failed_task_is_retried_then_marked_failed():
+    task_obj = enqueue(always_fails.task_name)
+    Task.objects.filter(pk=task_obj.pk).update(max_attempts=1)
+    run_pending()
+    task_obj.refresh_from_db()
+    assert task_obj.status == Task.Status.FAILED
+    assert "boom" in task_obj.last_error
+
+
+def test_stale_running_task_recovered():
+    started_at = timezone.now() - timedelta(hours=1)
+    for value, attempts in ((5, 1), (6, 3)):
+        task_obj = record_call.delay(value=value)
+        Task.objects.filter(pk=task_obj.pk).update(
+            status=Task.Status.RUNNING, attempts=attempts,
+            started_at=started_at,
+        )
+    fresh = record_call.delay(value=7)
+    Task.objects.filter(pk=fresh.pk).update(
+        status=Task.Status.RUNNING, started_at=timezone.now()
+    )
+    assert run_pending() == 1
+    assert calls == [5]
+    assert sorted(Task.objects.values_list("status", flat=True)) == [
+        Task.Status.DONE, Task.Status.FAILED, Task.Status.RUNNING
+    ]
+
+
+def test_eager_mode(settings):
+    settings.TASKS_ALWAYS_EAGER = True
+    record_call.delay(value=4)
+    assert calls == [4]
+    assert not Task.objects.exists()
+
+
+def test_password_reset_email_is_queued(settings, client, user):
+    settings.EMAIL_BACKEND = "tasks.mail.QueuedEmailBackend"
+    settings.TASKS_EMAIL_BACKEND = (
+        "django.core.mail.backends.locmem.EmailBackend"
+    )
+    user.email = "reader@example.com"
+    user.save()
+    client.post("/auth/password_reset/", {"email": user.email})
+    assert mail.outbox == []
+    assert Task.objects.filter(status=Task.Status.PENDING).exists()
+    call_command("run_tasks", "--once")
+    assert [m.to for m in mail.outbox] == [[user.email]]